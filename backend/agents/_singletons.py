@@ -0,0 +1,21 @@
+"""
+Shared agent instances for the routers.
+The agents are stateless front-ends over module-level stores, but each
+router constructing its own copies duplicated instances (and would
+silently split any per-instance cache an agent grows later). Routers
+import from here; EligibilityAgent is absent because it needs the
+SchemeGraph built at startup — the schemes router receives it via
+init_graph.
+"""
+
+from backend.agents.adversarial import AdversarialAgent
+from backend.agents.appeals import AppealsAgent
+from backend.agents.document import DocumentAgent
+from backend.agents.execution import ExecutionAgent
+from backend.agents.profiler import ProfilerAgent
+
+PROFILER = ProfilerAgent()
+DOCUMENT = DocumentAgent()
+ADVERSARIAL = AdversarialAgent()
+EXECUTION = ExecutionAgent()
+APPEALS = AppealsAgent()
@@ -6,12 +6,17 @@ probability, identify risk factors, and generate recommendations.
 
 from __future__ import annotations
 
+import asyncio
+
 from backend.models.citizen import CitizenProfile
 from backend.models.scheme import Scheme
 from backend.models.application import Application, RejectionAnalysis
 from backend.engine.validation import predict_rejection
-from backend.engine.rejection_model import predict_rejection_probability
-from backend.knowledge.schemes_data import SCHEME_MAP
+from backend.engine.rejection_model import (
+    predict_rejection_probability,
+    predict_rejection_probability_batch,
+)
+from backend.knowledge.schemes_data import SCHEME_MAP, docs_to_bits
 
 
 class AdversarialAgent:
@@ -36,7 +41,11 @@ class AdversarialAgent:
         # ML model prediction (simulated)
         ml_prob = predict_rejection_probability(citizen, scheme)
 
-        # Combine: weighted average (60% rule-based, 40% ML)
+        return self._combine(analysis, ml_prob)
+
+    @staticmethod
+    def _combine(analysis: RejectionAnalysis, ml_prob: float) -> RejectionAnalysis:
+        """Blend rule-based and ML scores: weighted average (60% / 40%)."""
         combined = analysis.rejection_probability * 0.6 + ml_prob * 0.4
         analysis.rejection_probability = round(combined, 2)
 
@@ -58,17 +67,19 @@ class AdversarialAgent:
         """
         Generate actionable fix recommendations based on risk factors (Req 4.4).
         """
-        recs = list(analysis.recommendations)
-
-        if analysis.risk_level in ("high", "critical"):
-            recs.insert(0, "⚠ HIGH RISK — Address the following issues before submitting:")
-
-        if analysis.rejection_probability > 0.5:
-            recs.append(
-                "Consider applying through a Common Service Centre (CSC) for assisted form-filling"
-            )
-
-        return recs
+        header = (
+            ["⚠ HIGH RISK — Address the following issues before submitting:"]
+            if analysis.risk_level in ("high", "critical")
+            else []
+        )
+        footer = (
+            ["Consider applying through a Common Service Centre (CSC) for assisted form-filling"]
+            if analysis.rejection_probability > 0.5
+            else []
+        )
+
+        # One allocation, no copy-then-insert shifting
+        return [*header, *analysis.recommendations, *footer]
 
     def update_prediction(
         self,
@@ -80,10 +91,17 @@ class AdversarialAgent:
         Re-run prediction after citizen applies corrections (Req 4.5).
         Applies corrections to a copy of the profile and re-predicts.
         """
-        # Apply corrections to a copy
-        updated_data = citizen.model_dump()
-        updated_data.update(corrections)
-        updated_citizen = CitizenProfile(**updated_data)
+        # Clone with only the corrected fields touched — avoids dumping and
+        # re-validating the entire profile for a handful of changes
+        updated_citizen = citizen.model_copy(update=corrections)
+
+        # model_copy carries over derived caches from the source profile;
+        # refresh the ones the corrections invalidate so the scorer sees
+        # the corrected documents, not the stale bitmask
+        if "documents" in corrections:
+            updated_citizen._docs_bitmask = docs_to_bits(updated_citizen.documents)
+        if "family_members" in corrections:
+            updated_citizen._drop_family_cache()
 
         return self.predict_rejection(updated_citizen, scheme_id)
 
@@ -94,11 +112,52 @@ class AdversarialAgent:
     ) -> dict[str, RejectionAnalysis]:
         """
         Predict rejection for multiple schemes at once.
-        Returns a dict of scheme_id → analysis.
+        Citizen features are encoded once and shared across the whole batch
+        by the batched ML scorer. Returns a dict of scheme_id → analysis.
         """
+        sm = SCHEME_MAP
+        schemes = [s for sid in scheme_ids if (s := sm.get(sid))]
+        ml_probs = predict_rejection_probability_batch(citizen, schemes)
+
         results: dict[str, RejectionAnalysis] = {}
-        for sid in scheme_ids:
-            analysis = self.predict_rejection(citizen, sid)
-            if analysis:
-                results[sid] = analysis
+        for scheme, ml_prob in zip(schemes, ml_probs):
+            analysis = predict_rejection(citizen, scheme)
+            results[scheme.scheme_id] = self._combine(analysis, ml_prob)
         return results
+
+    async def predict_rejection_async(
+        self,
+        citizen: CitizenProfile,
+        scheme_id: str,
+    ) -> RejectionAnalysis | None:
+        """
+        Async variant of predict_rejection. The simulated model runs in a
+        worker thread so a future remote (SageMaker) call can overlap I/O.
+        """
+        return await asyncio.to_thread(self.predict_rejection, citizen, scheme_id)
+
+    async def batch_predict_async(
+        self,
+        citizen: CitizenProfile,
+        scheme_ids: list[str],
+        max_concurrency: int = 8,
+    ) -> dict[str, RejectionAnalysis]:
+        """
+        Predict rejection for multiple schemes concurrently.
+        Independent predictions overlap via asyncio.gather, bounded by a
+        semaphore so a large batch can't flood the model backend.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def predict_one(sid: str) -> RejectionAnalysis | None:
+            async with semaphore:
+                return await self.predict_rejection_async(citizen, sid)
+
+        analyses = await asyncio.gather(
+            *(predict_one(sid) for sid in scheme_ids)
+        )
+        return {
+            sid: analysis
+            for sid, analysis in zip(scheme_ids, analyses)
+            if analysis
+        }
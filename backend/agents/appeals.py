@@ -6,9 +6,12 @@ formal appeal letters with legal precedents.
 
 from __future__ import annotations
 
-import uuid
+import re
 from datetime import datetime
+from functools import lru_cache
 
+from backend.util.ids import short_id
+from backend.util import clock
 from backend.models.application import Application, ApplicationStatus
 from backend.models.citizen import CitizenProfile
 from backend.knowledge.schemes_data import SCHEME_MAP
@@ -40,6 +43,35 @@ _LEGAL_PRECEDENTS = {
 }
 
 
+_WORD_RE = re.compile(r"\S+")
+
+# One compiled pattern per category, tried in priority order: a reason
+# mentioning both documents and delays is a document case, wherever the
+# words fall in the sentence.
+_CATEGORY_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("document_discrepancy", re.compile(
+        r"document|missing|incomplete|discrepancy", re.IGNORECASE)),
+    ("income_mismatch", re.compile(r"income|salary|earning", re.IGNORECASE)),
+    ("processing_delay", re.compile(r"delay|timeout|processing", re.IGNORECASE)),
+    ("age_cutoff", re.compile(r"age|overaged|underage", re.IGNORECASE)),
+)
+
+
+@lru_cache(maxsize=512)
+def _categorize_reason(reason: str) -> str:
+    """Map a rejection reason to a precedent category (cached per reason)."""
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(reason):
+            return category
+    return "generic"
+
+
+def _category_and_precedent(reason: str) -> tuple[str, str]:
+    """Resolve category and its legal precedent in one call."""
+    category = _categorize_reason(reason)
+    return category, _LEGAL_PRECEDENTS.get(category, _LEGAL_PRECEDENTS["generic"])
+
+
 class AppealsAgent:
     """Handles rejection analysis, appeal viability, and letter generation."""
 
@@ -51,7 +83,7 @@ class AppealsAgent:
         scheme = SCHEME_MAP.get(application.scheme_id)
 
         # Categorize rejection reason
-        category = self._categorize_reason(rejection_reason)
+        category, precedent = _category_and_precedent(rejection_reason)
 
         # Assess viability
         viability_score = self._assess_viability(category, application)
@@ -72,7 +104,7 @@ class AppealsAgent:
                 if viability_score >= 0.4
                 else "Consider re-applying with corrected documents"
             ),
-            "relevant_precedent": _LEGAL_PRECEDENTS.get(category, _LEGAL_PRECEDENTS["generic"]),
+            "relevant_precedent": precedent,
             "time_limit": "30 days from rejection date",
         }
 
@@ -90,25 +122,38 @@ class AppealsAgent:
         scheme_name = scheme.name if scheme else application.scheme_id
         ministry = scheme.ministry if scheme else "Concerned Ministry"
         rejection_reason = application.rejection_reason or "unspecified reason"
-        category = self._categorize_reason(rejection_reason)
-        precedent = _LEGAL_PRECEDENTS.get(category, _LEGAL_PRECEDENTS["generic"])
-
-        if language == "hindi":
-            letter = self._generate_hindi_letter(
-                citizen, scheme_name, ministry, rejection_reason, precedent, application
-            )
-        else:
-            letter = self._generate_english_letter(
-                citizen, scheme_name, ministry, rejection_reason, precedent, application
-            )
+        _, precedent = _category_and_precedent(rejection_reason)
+
+        # One clock read per letter — shared by the letter body and metadata
+        now = datetime.now()
+        letter_date = now.strftime("%d/%m/%Y")
+
+        # The body is deterministic given these fields, so a preview followed
+        # by a submit renders the template only once (memoized below)
+        letter = _build_letter_body(
+            language,
+            application.application_id,
+            scheme_name,
+            ministry,
+            rejection_reason,
+            precedent,
+            citizen.name,
+            citizen.address.city,
+            citizen.address.state,
+            citizen.caste_category.value,
+            citizen.annual_income,
+            citizen.aadhaar_number[-4:] if len(citizen.aadhaar_number) >= 4 else "XXXX",
+            letter_date,
+        )
 
         return {
-            "letter_id": f"APL-{uuid.uuid4().hex[:8].upper()}",
+            "letter_id": short_id("APL"),
             "application_id": application.application_id,
             "language": language,
             "letter_text": letter,
-            "generated_at": datetime.now().isoformat(),
-            "word_count": len(letter.split()),
+            "generated_at": now.isoformat(),
+            # Count words without materializing the split list
+            "word_count": sum(1 for _ in _WORD_RE.finditer(letter)),
         }
 
     def submit_appeal(
@@ -119,7 +164,7 @@ class AppealsAgent:
         """
         application.status = ApplicationStatus.APPEALED
         application.appeal_letter = appeal_letter
-        application.appeal_date = datetime.now().isoformat()
+        application.appeal_date = clock.now_iso()
         application.add_audit(
             action="Appeal submitted",
             agent="AppealsAgent",
@@ -130,18 +175,6 @@ class AppealsAgent:
 
     # ── Private Methods ──────────────────────────────────────────────────
 
-    def _categorize_reason(self, reason: str) -> str:
-        reason_lower = reason.lower()
-        if any(w in reason_lower for w in ("document", "missing", "incomplete", "discrepancy")):
-            return "document_discrepancy"
-        if any(w in reason_lower for w in ("income", "salary", "earning")):
-            return "income_mismatch"
-        if any(w in reason_lower for w in ("delay", "timeout", "processing")):
-            return "processing_delay"
-        if any(w in reason_lower for w in ("age", "overaged", "underage")):
-            return "age_cutoff"
-        return "generic"
-
     def _assess_viability(self, category: str, app: Application) -> float:
         scores = {
             "document_discrepancy": 0.75,
@@ -158,10 +191,75 @@ class AppealsAgent:
 
         return round(base, 2)
 
-    def _generate_english_letter(
-        self, citizen, scheme_name, ministry, rejection_reason, precedent, application
-    ) -> str:
-        return f"""APPEAL AGAINST REJECTION OF APPLICATION
+
+@lru_cache(maxsize=256)
+def _build_letter_body(
+    language: str,
+    application_id: str,
+    scheme_name: str,
+    ministry: str,
+    rejection_reason: str,
+    precedent: str,
+    name: str,
+    city: str,
+    state: str,
+    caste: str,
+    annual_income: float,
+    aadhaar_last4: str,
+    letter_date: str,
+) -> str:
+    """Render the appeal letter body. All arguments are stable scalars, so
+    repeated renders (preview → submit) hit the cache instead of rebuilding
+    the ~1KB template string. Language selection is a table lookup — adding
+    a language means adding a template to _LETTER_TEMPLATES."""
+    template = _LETTER_TEMPLATES.get(language, _ENGLISH_LETTER_TMPL)
+    return template.format(
+        application_id=application_id,
+        scheme_name=scheme_name,
+        ministry=ministry,
+        rejection_reason=rejection_reason,
+        precedent=precedent,
+        name=name,
+        city=city,
+        state=state,
+        caste_upper=caste.upper(),
+        annual_income=annual_income,
+        aadhaar_last4=aadhaar_last4,
+        letter_date=letter_date,
+        place=city or "N/A",
+    )
+
+
+_HINDI_LETTER_TMPL = """अपील — आवेदन अस्वीकृति के विरुद्ध
+
+सेवा में,
+सक्षम प्राधिकारी / अपीलीय अधिकारी,
+{ministry},
+भारत सरकार।
+
+विषय: {scheme_name} योजना के आवेदन अस्वीकृति के विरुद्ध अपील
+       (आवेदन संख्या: {application_id})
+
+महोदय/महोदया,
+
+मैं, {name}, भारत का नागरिक, {city}, {state} का निवासी, {scheme_name} योजना के तहत मेरे आवेदन की अस्वीकृति के विरुद्ध यह अपील प्रस्तुत करता/करती हूँ।
+
+मेरा आवेदन (संदर्भ: {application_id}) निम्नलिखित आधार पर अस्वीकार किया गया:
+"{rejection_reason}"
+
+मैं नम्रतापूर्वक निवेदन करता/करती हूँ कि यह अस्वीकृति अन्यायपूर्ण है।
+
+मैं प्रार्थना करता/करती हूँ कि कृपया मेरे आवेदन पर पुनर्विचार किया जाए।
+
+धन्यवाद,
+
+{name}
+आधार: XXXX-XXXX-{aadhaar_last4}
+दिनांक: {letter_date}
+स्थान: {place}
+"""
+
+_ENGLISH_LETTER_TMPL = """APPEAL AGAINST REJECTION OF APPLICATION
 
 To,
 The Competent Authority / Appellate Officer,
@@ -169,13 +267,13 @@ The Competent Authority / Appellate Officer,
 Government of India.
 
 Subject: Appeal against rejection of application for {scheme_name}
-         (Application No.: {application.application_id})
+         (Application No.: {application_id})
 
 Respected Sir/Madam,
 
-I, {citizen.name}, a citizen of India, residing at {citizen.address.city}, {citizen.address.state}, respectfully submit this appeal against the rejection of my application for the {scheme_name} scheme.
+I, {name}, a citizen of India, residing at {city}, {state}, respectfully submit this appeal against the rejection of my application for the {scheme_name} scheme.
 
-My application (Reference: {application.application_id}) was rejected on the following grounds:
+My application (Reference: {application_id}) was rejected on the following grounds:
 "{rejection_reason}"
 
 I respectfully submit that this rejection is unjustified for the following reasons:
@@ -186,16 +284,16 @@ I respectfully submit that this rejection is unjustified for the following reaso
 
 I humbly request that my application be reconsidered in light of the above facts and the attached supporting documents.
 
-I am a {citizen.caste_category.value.upper()} category applicant with an annual family income of ₹{citizen.annual_income:,.0f}, and I meet all the prescribed eligibility conditions for this scheme.
+I am a {caste_upper} category applicant with an annual family income of ₹{annual_income:,.0f}, and I meet all the prescribed eligibility conditions for this scheme.
 
 I pray that this Hon'ble authority may kindly reconsider my application and pass appropriate orders.
 
 Thanking you,
 
-{citizen.name}
-Aadhaar: XXXX-XXXX-{citizen.aadhaar_number[-4:] if len(citizen.aadhaar_number) >= 4 else 'XXXX'}
-Date: {datetime.now().strftime('%d/%m/%Y')}
-Place: {citizen.address.city or 'N/A'}
+{name}
+Aadhaar: XXXX-XXXX-{aadhaar_last4}
+Date: {letter_date}
+Place: {place}
 
 Enclosures:
 1. Copy of rejection letter
@@ -203,34 +301,7 @@ Enclosures:
 3. Supporting documents addressing rejection grounds
 """
 
-    def _generate_hindi_letter(
-        self, citizen, scheme_name, ministry, rejection_reason, precedent, application
-    ) -> str:
-        return f"""अपील — आवेदन अस्वीकृति के विरुद्ध
-
-सेवा में,
-सक्षम प्राधिकारी / अपीलीय अधिकारी,
-{ministry},
-भारत सरकार।
-
-विषय: {scheme_name} योजना के आवेदन अस्वीकृति के विरुद्ध अपील
-       (आवेदन संख्या: {application.application_id})
-
-महोदय/महोदया,
-
-मैं, {citizen.name}, भारत का नागरिक, {citizen.address.city}, {citizen.address.state} का निवासी, {scheme_name} योजना के तहत मेरे आवेदन की अस्वीकृति के विरुद्ध यह अपील प्रस्तुत करता/करती हूँ।
-
-मेरा आवेदन (संदर्भ: {application.application_id}) निम्नलिखित आधार पर अस्वीकार किया गया:
-"{rejection_reason}"
-
-मैं नम्रतापूर्वक निवेदन करता/करती हूँ कि यह अस्वीकृति अन्यायपूर्ण है।
-
-मैं प्रार्थना करता/करती हूँ कि कृपया मेरे आवेदन पर पुनर्विचार किया जाए।
-
-धन्यवाद,
-
-{citizen.name}
-आधार: XXXX-XXXX-{citizen.aadhaar_number[-4:] if len(citizen.aadhaar_number) >= 4 else 'XXXX'}
-दिनांक: {datetime.now().strftime('%d/%m/%Y')}
-स्थान: {citizen.address.city or 'N/A'}
-"""
+_LETTER_TEMPLATES: dict[str, str] = {
+    "english": _ENGLISH_LETTER_TMPL,
+    "hindi": _HINDI_LETTER_TMPL,
+}
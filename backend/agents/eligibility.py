@@ -35,41 +35,32 @@ class EligibilityAgent:
         scheme = SCHEME_MAP.get(scheme_id)
         if not scheme:
             return None
-
-        matches = self.graph.discover_schemes(citizen)
-        for match in matches:
-            if match.scheme.scheme_id == scheme_id:
-                return match
-        return None
+        return self.graph.evaluate_scheme(citizen, scheme)
 
     def find_benefit_chains(self, scheme_id: str) -> list[str]:
         """
         Find schemes unlocked by this scheme (multi-hop, Req 2.5).
         """
         dependent_ids = self.graph.find_benefit_chain(scheme_id)
-        return [
-            SCHEME_MAP[sid].name
-            for sid in dependent_ids
-            if sid in SCHEME_MAP
-        ]
+        sm = SCHEME_MAP
+        return [s.name for sid in dependent_ids if (s := sm.get(sid))]
 
     def detect_conflicts(self, scheme_ids: list[str]) -> list[dict]:
         """
         Detect mutually exclusive schemes (Req 2.4, Property 7).
         """
         conflict_pairs = self.graph.detect_conflicts(scheme_ids)
-        results = []
-        for a, b in conflict_pairs:
-            name_a = SCHEME_MAP[a].name if a in SCHEME_MAP else a
-            name_b = SCHEME_MAP[b].name if b in SCHEME_MAP else b
-            results.append({
+        sm = SCHEME_MAP  # local alias keeps the loop on LOAD_FAST lookups
+        return [
+            {
                 "scheme_a": a,
-                "scheme_a_name": name_a,
+                "scheme_a_name": (name_a := sm[a].name if a in sm else a),
                 "scheme_b": b,
-                "scheme_b_name": name_b,
+                "scheme_b_name": (name_b := sm[b].name if b in sm else b),
                 "message": f"'{name_a}' and '{name_b}' are mutually exclusive. Apply for only one.",
-            })
-        return results
+            }
+            for a, b in conflict_pairs
+        ]
 
     def get_top_schemes(
         self, citizen: CitizenProfile, limit: int = 5
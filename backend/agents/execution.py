@@ -6,24 +6,58 @@ confirmation capture, and audit logging.
 
 from __future__ import annotations
 
-import uuid
-import random
 import asyncio
+import threading
 from datetime import datetime, timedelta
+from typing import NamedTuple
 
+from backend.util import clock
+from backend.util.ids import short_id
+from backend.util.rng import next_uniform
+from backend.store.kv import ShardedStore
 from backend.models.application import Application, ApplicationStatus, AuditEntry
 from backend.models.citizen import CitizenProfile
 from backend.models.scheme import Scheme
-from backend.knowledge.schemes_data import SCHEME_MAP
+from backend.knowledge.schemes_data import SCHEME_COLS, SCHEME_INDEX, SCHEME_MAP
 
 
-# In-memory application store
-_applications: dict[str, Application] = {}
+# In-memory application store — sharded, bounded, thread-safe
+_applications: ShardedStore = ShardedStore()
+
+# Inverted index for per-citizen listing: citizen_id -> [application_id].
+# Keeps list_applications O(k) in the citizen's own applications instead
+# of a scan over the whole store.
+_apps_by_citizen: dict[str, list[str]] = {}
+_apps_index_lock = threading.Lock()
 
 # Retry configuration (Req 5.5)
 MAX_RETRIES = 3
 BACKOFF_BASE = 1  # seconds
 
+# Per-tier simulation tables, indexed by tier number (slot 0 unused) —
+# no dict allocation or if/elif chain per attempt
+_TIER_PROB = (0.0, 0.90, 0.80, 0.95)
+_TIER_ACTION = (
+    "",
+    "API submission to portal",
+    "Web automation form-fill",
+    "PDF generation and upload",
+)
+
+# Constant audit details for the simulated status transitions
+_UNDER_REVIEW_DETAILS = "Application moved to under review by department"
+_APPROVED_DETAILS = "Application approved by competent authority"
+_DISBURSEMENT_DETAILS = "Benefit will be credited to linked bank account via DBT"
+
+
+class TierResult(NamedTuple):
+    """Outcome of one simulated tier attempt — cheaper to build and read
+    than a throwaway dict per attempt."""
+    success: bool
+    message: str
+    confirmation: str = ""
+    error: str = ""
+
 
 class ExecutionAgent:
     """Handles multi-tier application submission and tracking."""
@@ -33,64 +67,115 @@ class ExecutionAgent:
         citizen: CitizenProfile,
         scheme_id: str,
         rejection_probability: float = 0.0,
+        scheme: Scheme | None = None,
     ) -> Application:
         """
         Submit an application using the appropriate tier (Req 5.1–5.3).
         Tier 1: API → Tier 2: Web Automation → Tier 3: PDF Generation.
+        Callers that already hold the Scheme (e.g. the orchestrator after
+        eligibility) can pass it to skip the map lookup.
         """
-        scheme = SCHEME_MAP.get(scheme_id)
-        if not scheme:
-            raise ValueError(f"Scheme '{scheme_id}' not found")
+        clock.refresh()  # one clock read shared by this run's audit stamps
+        app = self._new_application(citizen, scheme_id)
+        if scheme is None:
+            scheme = SCHEME_MAP[scheme_id]
+
+        success = False
+        tier = app.execution_tier
+        for attempt in range(1, MAX_RETRIES + 1):
+            result = self._execute_tier(tier, citizen, scheme, attempt)
+            tier, success = self._record_attempt(app, tier, attempt, result)
+            if success:
+                break
+
+        return self._finalize_submission(app, success)
 
-        app_id = f"APP-{uuid.uuid4().hex[:8].upper()}"
+    async def submit_application_async(
+        self,
+        citizen: CitizenProfile,
+        scheme_id: str,
+        rejection_probability: float = 0.0,
+        scheme: Scheme | None = None,
+    ) -> Application:
+        """
+        Async variant of submit_application (Req 5.5): waits out an
+        exponential backoff between failed attempts via asyncio.sleep,
+        so concurrent submissions keep the event loop free (a time.sleep
+        here would serialize every in-flight request).
+        """
+        clock.refresh()  # one clock read shared by this run's audit stamps
+        app = self._new_application(citizen, scheme_id)
+        if scheme is None:
+            scheme = SCHEME_MAP[scheme_id]
 
-        app = Application(
-            application_id=app_id,
+        success = False
+        tier = app.execution_tier
+        for attempt in range(1, MAX_RETRIES + 1):
+            result = self._execute_tier(tier, citizen, scheme, attempt)
+            tier, success = self._record_attempt(app, tier, attempt, result)
+            if success:
+                break
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(min(BACKOFF_BASE * 2 ** (attempt - 1), 10))
+
+        return self._finalize_submission(app, success)
+
+    def _new_application(self, citizen: CitizenProfile, scheme_id: str) -> Application:
+        """Build the draft Application for a submission run."""
+        idx = SCHEME_INDEX.get(scheme_id)
+        if idx is None:
+            raise ValueError(f"Scheme '{scheme_id}' not found")
+
+        # Scalar fields come from the SoA columns — one index per field
+        # instead of five Pydantic attribute loads
+        cols = SCHEME_COLS
+        return Application(
+            application_id=short_id("APP"),
             citizen_id=citizen.citizen_id,
             scheme_id=scheme_id,
-            scheme_name=scheme.name,
+            scheme_name=cols["name"][idx],
             status=ApplicationStatus.DRAFT,
-            execution_tier=scheme.execution_tier,
-            portal_url=scheme.portal_url,
-            benefit_amount=scheme.benefit_amount,
+            execution_tier=cols["execution_tier"][idx],
+            portal_url=cols["portal_url"][idx],
+            benefit_amount=cols["benefit_amount"][idx],
             expected_decision_date=(
-                datetime.now() + timedelta(days=scheme.processing_days)
+                datetime.now() + timedelta(days=cols["processing_days"][idx])
             ).isoformat(),
         )
 
-        # Simulate tier-based submission
-        success = False
-        tier = scheme.execution_tier
+    def _record_attempt(
+        self, app: Application, tier: int, attempt: int, result: TierResult
+    ) -> tuple[int, bool]:
+        """Audit one attempt; returns the (possibly advanced) tier and success."""
+        app.add_audit(
+            action=f"Tier {tier} submission attempt {attempt}",
+            agent="ExecutionAgent",
+            details=result.message,
+            success=result.success,
+            error=result.error,
+        )
 
-        for attempt in range(1, MAX_RETRIES + 1):
-            result = self._execute_tier(tier, citizen, scheme, attempt)
+        if result.success:
+            app.confirmation_number = result.confirmation
+            return tier, True
+
+        # Fallback to next tier
+        if attempt == MAX_RETRIES and tier < 3:
+            tier += 1
+            app.execution_tier = tier
             app.add_audit(
-                action=f"Tier {tier} submission attempt {attempt}",
+                action=f"Tier fallback to Tier {tier}",
                 agent="ExecutionAgent",
-                details=result["message"],
-                success=result["success"],
-                error=result.get("error", ""),
+                details=f"Falling back from Tier {tier-1} to Tier {tier}",
+                success=True,
             )
+        return tier, False
 
-            if result["success"]:
-                success = True
-                app.confirmation_number = result.get("confirmation", "")
-                break
-
-            # Fallback to next tier
-            if attempt == MAX_RETRIES and tier < 3:
-                tier += 1
-                app.execution_tier = tier
-                app.add_audit(
-                    action=f"Tier fallback to Tier {tier}",
-                    agent="ExecutionAgent",
-                    details=f"Falling back from Tier {tier-1} to Tier {tier}",
-                    success=True,
-                )
-
+    def _finalize_submission(self, app: Application, success: bool) -> Application:
+        """Stamp the final status and persist the application."""
         if success:
             app.status = ApplicationStatus.SUBMITTED
-            app.submission_date = datetime.now().isoformat()
+            app.submission_date = clock.now_iso()
         else:
             app.status = ApplicationStatus.DRAFT
             app.add_audit(
@@ -100,39 +185,32 @@ class ExecutionAgent:
                 success=False,
             )
 
-        _applications[app_id] = app
+        _applications[app.application_id] = app
+        with _apps_index_lock:
+            _apps_by_citizen.setdefault(app.citizen_id, []).append(app.application_id)
         return app
 
     def _execute_tier(
         self, tier: int, citizen: CitizenProfile, scheme: Scheme, attempt: int
-    ) -> dict:
+    ) -> TierResult:
         """Simulate a tier execution attempt."""
         # Simulated success probability (higher for lower tiers)
-        success_rate = {1: 0.90, 2: 0.80, 3: 0.95}
-        prob = success_rate.get(tier, 0.80)
+        prob = _TIER_PROB[tier] if 0 < tier < 4 else 0.80
+        action = _TIER_ACTION[tier] if 0 < tier < 4 else _TIER_ACTION[3]
 
-        success = random.random() < prob
-
-        if tier == 1:
-            action = "API submission to portal"
-        elif tier == 2:
-            action = "Web automation form-fill"
-        else:
-            action = "PDF generation and upload"
+        success = next_uniform() < prob
 
         if success:
-            conf = f"CONF-{uuid.uuid4().hex[:10].upper()}"
-            return {
-                "success": True,
-                "message": f"{action} succeeded on attempt {attempt}",
-                "confirmation": conf,
-            }
-        else:
-            return {
-                "success": False,
-                "message": f"{action} failed on attempt {attempt}",
-                "error": "Simulated transient failure — portal timeout",
-            }
+            return TierResult(
+                success=True,
+                message=f"{action} succeeded on attempt {attempt}",
+                confirmation=short_id("CONF", 5),
+            )
+        return TierResult(
+            success=False,
+            message=f"{action} failed on attempt {attempt}",
+            error="Simulated transient failure — portal timeout",
+        )
 
     def poll_status(self, application_id: str) -> Application | None:
         """
@@ -142,44 +220,45 @@ class ExecutionAgent:
         app = _applications.get(application_id)
         if not app:
             return None
+        clock.refresh()  # shared by any transition stamped below
 
         # Simulate status progression
         if app.status == ApplicationStatus.SUBMITTED:
             # Randomly progress to next stage
-            roll = random.random()
+            roll = next_uniform()
             if roll < 0.3:
                 app.status = ApplicationStatus.UNDER_REVIEW
                 app.add_audit(
                     action="Status update",
                     agent="ExecutionAgent",
-                    details="Application moved to under review by department",
+                    details=_UNDER_REVIEW_DETAILS,
                     success=True,
                 )
-            _applications[app.application_id] = app
 
         elif app.status == ApplicationStatus.UNDER_REVIEW:
-            roll = random.random()
+            roll = next_uniform()
             if roll < 0.2:
                 app.status = ApplicationStatus.APPROVED
-                app.disbursement_details = "Benefit will be credited to linked bank account via DBT"
+                app.disbursement_details = _DISBURSEMENT_DETAILS
                 app.add_audit(
                     action="Application approved",
                     agent="ExecutionAgent",
-                    details="Application approved by competent authority",
+                    details=_APPROVED_DETAILS,
                     success=True,
                 )
             elif roll < 0.3:
                 app.status = ApplicationStatus.REJECTED
                 app.rejection_reason = "Document verification discrepancy found"
-                app.rejection_date = datetime.now().isoformat()
+                app.rejection_date = clock.now_iso()
                 app.add_audit(
                     action="Application rejected",
                     agent="ExecutionAgent",
                     details=f"Rejected: {app.rejection_reason}",
                     success=False,
                 )
-            _applications[app.application_id] = app
 
+        # No store write-back needed: `app` is the stored reference and
+        # the transitions above mutate it in place
         return app
 
     def generate_prefilled_pdf(
@@ -194,7 +273,7 @@ class ExecutionAgent:
             return {"error": "Scheme not found"}
 
         return {
-            "pdf_id": f"PDF-{uuid.uuid4().hex[:8].upper()}",
+            "pdf_id": short_id("PDF"),
             "scheme_name": scheme.name,
             "citizen_name": citizen.name,
             "status": "generated",
@@ -217,7 +296,7 @@ class ExecutionAgent:
 
     def list_applications(self, citizen_id: str) -> list[Application]:
         """List all applications for a citizen (Req 6.7)."""
-        return [
-            app for app in _applications.values()
-            if app.citizen_id == citizen_id
-        ]
+        with _apps_index_lock:
+            app_ids = list(_apps_by_citizen.get(citizen_id, ()))
+        # Entries evicted or expired from the store are skipped
+        return [app for app_id in app_ids if (app := _applications.get(app_id))]
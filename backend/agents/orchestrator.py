@@ -7,14 +7,18 @@ and event emission (Step Functions simulation).
 
 from __future__ import annotations
 
-import uuid
+import asyncio
 import logging
-from datetime import datetime
+import operator
+from collections import deque
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer, field_validator
 
+from backend.util import clock
+from backend.util.ids import short_id
 from backend.models.citizen import CitizenProfile
-from backend.models.scheme import SchemeMatch
+from backend.models.document import DOC_TYPE_BY_VALUE, DocumentType
+from backend.models.scheme import Scheme, SchemeMatch
 from backend.models.application import Application, RejectionAnalysis
 from backend.agents.profiler import ProfilerAgent
 from backend.agents.eligibility import EligibilityAgent
@@ -23,9 +27,14 @@ from backend.agents.adversarial import AdversarialAgent
 from backend.agents.execution import ExecutionAgent
 from backend.agents.appeals import AppealsAgent
 from backend.knowledge.graph import SchemeGraph
+from backend.store.kv import ShardedStore
 
 logger = logging.getLogger("bharatbridge.orchestrator")
 
+# Valid document-type names resolved once — the document stage does a
+# dict get per name instead of DocumentType(...) + ValueError control flow
+_VALID_DOC_TYPES: dict[str, DocumentType] = DOC_TYPE_BY_VALUE
+
 
 class PipelineStage(str, Enum):
     PROFILE = "profile"
@@ -39,31 +48,84 @@ class PipelineStage(str, Enum):
 
 class PipelineEvent(BaseModel):
     stage: PipelineStage
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = Field(default_factory=clock.now_iso)
     message: str = ""
     data: dict = Field(default_factory=dict)
     success: bool = True
 
 
+# Per-pipeline event cap — older entries roll off the front
+MAX_EVENTS = 256
+
+
 class PipelineState(BaseModel):
     """Full state of a pipeline execution (persisted in-memory)."""
     pipeline_id: str = ""
     citizen_id: str = ""
     current_stage: PipelineStage = PipelineStage.PROFILE
-    events: list[PipelineEvent] = Field(default_factory=list)
+    events: deque[PipelineEvent] = Field(
+        default_factory=lambda: deque(maxlen=MAX_EVENTS)
+    )
+    events_truncated: int = 0
     profile: dict = Field(default_factory=dict)
     eligible_schemes: list[dict] = Field(default_factory=list)
     selected_scheme_id: str = ""
     documents_processed: list[dict] = Field(default_factory=list)
     rejection_analysis: dict = Field(default_factory=dict)
     application: dict = Field(default_factory=dict)
-    started_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    started_at: str = Field(default_factory=clock.now_iso)
     completed_at: str = ""
     error: str = ""
 
-
-# In-memory pipeline store
-_pipelines: dict[str, PipelineState] = {}
+    # Raw event dicts buffered during a run; materialized into `events`
+    # in one pass at finalize time (not part of the serialized state)
+    _event_buffer: list[dict] = PrivateAttr(default_factory=list)
+
+    # Scheme resolved during eligibility, reused by execution so the
+    # submission path skips its own SCHEME_MAP lookup (not serialized)
+    _selected_scheme: Scheme | None = PrivateAttr(default=None)
+
+    @field_validator("events", mode="after")
+    @classmethod
+    def _cap_events(cls, v: deque) -> deque:
+        # Ring buffer: retry-heavy pipelines keep only the last MAX_EVENTS,
+        # so fetch-time serialization cost stays bounded
+        return v if v.maxlen == MAX_EVENTS else deque(v, maxlen=MAX_EVENTS)
+
+    @field_serializer("events")
+    def _serialize_events(self, v: deque) -> list[PipelineEvent]:
+        return list(v)
+
+
+# In-memory pipeline store — sharded, bounded, thread-safe
+_pipelines: ShardedStore = ShardedStore()
+
+
+# Field getters hoisted out of the match-dump loop — one bound getter
+# call per row instead of nine attribute lookups through the models
+_MATCH_FIELDS = operator.attrgetter(
+    "eligibility_score", "approval_probability", "estimated_benefit",
+    "is_eligible", "missing_documents", "conflicts", "rank",
+)
+_SCHEME_FIELDS = operator.attrgetter("scheme_id", "name")
+
+
+def _match_to_dict(m: SchemeMatch) -> dict:
+    """Flatten a SchemeMatch for pipeline state via direct attribute reads —
+    cheaper than a recursive model_dump walk over the embedded Scheme."""
+    sid, sname = _SCHEME_FIELDS(m.scheme)
+    score, approval, benefit, eligible, missing, conflicts, rank = _MATCH_FIELDS(m)
+    return {
+        "scheme_id": sid,
+        "scheme_name": sname,
+        "eligibility_score": score,
+        "approval_probability": approval,
+        "benefit_amount": benefit,
+        "is_eligible": eligible,
+        "missing_documents": missing,
+        "conflicts": conflicts,
+        "rank": rank,
+    }
 
 
 class OrchestratorAgent:
@@ -82,7 +144,7 @@ class OrchestratorAgent:
         Execute the full multi-agent pipeline (Req 9.1–9.3).
         Steps: profile → eligibility → documents → adversarial → execution.
         """
-        pipeline_id = f"PIPE-{uuid.uuid4().hex[:8].upper()}"
+        pipeline_id = short_id("PIPE")
         state = PipelineState(pipeline_id=pipeline_id)
 
         try:
@@ -119,17 +181,71 @@ class OrchestratorAgent:
                 )
 
             state.current_stage = PipelineStage.COMPLETE
-            state.completed_at = datetime.now().isoformat()
+            state.completed_at = clock.refresh()
+
+        except Exception as exc:
+            logger.exception("Pipeline failed")
+            state.current_stage = PipelineStage.FAILED
+            state.error = str(exc)
+            self._emit(state, PipelineStage.FAILED,
+                       f"Pipeline error: {exc}", success=False)
+
+        return self._finalize(state)
+
+    async def start_workflow_async(
+        self, profile_data: dict, scheme_id: str = ""
+    ) -> PipelineState:
+        """
+        Async variant of start_workflow for the API path (Req 9.1–9.3).
+        Stage order is unchanged, but the fan-out work inside stages runs
+        concurrently: document extraction is gathered across a worker-
+        thread pool, and the adversarial/execution stages await the
+        agents' async entry points so retries back off without holding
+        the event loop.
+        """
+        pipeline_id = short_id("PIPE")
+        state = PipelineState(pipeline_id=pipeline_id)
+
+        try:
+            state = self._run_profile_stage(state, profile_data)
+            if state.current_stage == PipelineStage.FAILED:
+                return self._finalize(state)
+
+            citizen = self.profiler.get_profile(state.citizen_id)
+            if not citizen:
+                state.error = "Profile creation failed"
+                state.current_stage = PipelineStage.FAILED
+                return self._finalize(state)
+
+            state = await asyncio.to_thread(
+                self._run_eligibility_stage, state, citizen, scheme_id
+            )
+            if state.current_stage == PipelineStage.FAILED:
+                return self._finalize(state)
+
+            state = await self._run_document_stage_async(state, citizen)
+
+            target_scheme = state.selected_scheme_id or (
+                state.eligible_schemes[0]["scheme_id"] if state.eligible_schemes else ""
+            )
+            if target_scheme:
+                state = await self._run_adversarial_stage_async(
+                    state, citizen, target_scheme
+                )
+                rejection_prob = state.rejection_analysis.get("rejection_probability", 0)
+                state = await self._run_execution_stage_async(
+                    state, citizen, target_scheme, rejection_prob
+                )
+
+            state.current_stage = PipelineStage.COMPLETE
+            state.completed_at = clock.refresh()
 
         except Exception as exc:
             logger.exception("Pipeline failed")
             state.current_stage = PipelineStage.FAILED
             state.error = str(exc)
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.FAILED,
-                message=f"Pipeline error: {exc}",
-                success=False,
-            ))
+            self._emit(state, PipelineStage.FAILED,
+                       f"Pipeline error: {exc}", success=False)
 
         return self._finalize(state)
 
@@ -137,117 +253,165 @@ class OrchestratorAgent:
 
     def _run_profile_stage(self, state: PipelineState, data: dict) -> PipelineState:
         state.current_stage = PipelineStage.PROFILE
+        clock.refresh()  # one clock read shared by this stage's stamps
         try:
             profile = self.profiler.create_profile(data)
             state.citizen_id = profile.citizen_id
             state.profile = profile.model_dump()
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.PROFILE,
-                message=f"Profile created: {profile.citizen_id}",
-                data={"citizen_id": profile.citizen_id, "name": profile.name},
-            ))
+            self._emit(state, PipelineStage.PROFILE,
+                       f"Profile created: {profile.citizen_id}",
+                       data={"citizen_id": profile.citizen_id, "name": profile.name})
         except Exception as exc:
             state.current_stage = PipelineStage.FAILED
             state.error = f"Profile stage failed: {exc}"
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.PROFILE, message=str(exc), success=False
-            ))
+            self._emit(state, PipelineStage.PROFILE, str(exc), success=False)
         return state
 
     def _run_eligibility_stage(
         self, state: PipelineState, citizen: CitizenProfile, scheme_id: str
     ) -> PipelineState:
         state.current_stage = PipelineStage.ELIGIBILITY
+        clock.refresh()  # one clock read shared by this stage's stamps
         try:
             matches = self.eligibility.discover_schemes(citizen)
-            state.eligible_schemes = [
-                {
-                    "scheme_id": m.scheme.scheme_id,
-                    "scheme_name": m.scheme.name,
-                    "eligibility_score": m.eligibility_score,
-                    "approval_probability": m.approval_probability,
-                    "benefit_amount": m.estimated_benefit,
-                    "is_eligible": m.is_eligible,
-                    "missing_documents": m.missing_documents,
-                    "conflicts": m.conflicts,
-                    "rank": m.rank,
-                }
-                for m in matches
-            ]
+
+            # Single pass: dump rows, count eligible, remember the top
+            # eligible scheme for auto-selection
+            rows: list[dict] = []
+            eligible_count = 0
+            first_eligible: SchemeMatch | None = None
+            for m in matches:
+                row = _match_to_dict(m)
+                rows.append(row)
+                if row["is_eligible"]:
+                    eligible_count += 1
+                    if first_eligible is None:
+                        first_eligible = m
+            state.eligible_schemes = rows
 
             if scheme_id:
                 state.selected_scheme_id = scheme_id
-            elif matches:
+                state._selected_scheme = next(
+                    (m.scheme for m in matches if m.scheme.scheme_id == scheme_id), None
+                )
+            elif first_eligible is not None:
                 # Auto-select top eligible scheme
-                eligible = [m for m in matches if m.is_eligible]
-                if eligible:
-                    state.selected_scheme_id = eligible[0].scheme.scheme_id
-
-            eligible_count = sum(1 for m in matches if m.is_eligible)
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.ELIGIBILITY,
-                message=f"Found {eligible_count} eligible schemes out of {len(matches)} total",
-                data={"eligible_count": eligible_count, "total": len(matches)},
-            ))
+                state.selected_scheme_id = first_eligible.scheme.scheme_id
+                state._selected_scheme = first_eligible.scheme
+            self._emit(state, PipelineStage.ELIGIBILITY,
+                       f"Found {eligible_count} eligible schemes out of {len(matches)} total",
+                       data={"eligible_count": eligible_count, "total": len(matches)})
         except Exception as exc:
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.ELIGIBILITY, message=str(exc), success=False
-            ))
+            self._emit(state, PipelineStage.ELIGIBILITY, str(exc), success=False)
         return state
 
     def _run_document_stage(
         self, state: PipelineState, citizen: CitizenProfile
     ) -> PipelineState:
         state.current_stage = PipelineStage.DOCUMENTS
+        clock.refresh()  # one clock read shared by this stage's stamps
         try:
-            from backend.models.document import DocumentType
             doc_types_to_process = citizen.documents or ["aadhaar", "income_certificate"]
             processed = []
             for doc_name in doc_types_to_process[:5]:  # Limit to 5 for demo
-                try:
-                    doc_type = DocumentType(doc_name)
-                    doc = self.document.process_document(doc_type)
-                    processed.append({
-                        "document_id": doc.document_id,
-                        "type": doc.document_type.value,
-                        "status": doc.authenticity_status.value,
-                        "confidence": doc.extraction_result.confidence if doc.extraction_result else 0,
-                    })
-                except ValueError:
-                    pass
+                doc_type = _VALID_DOC_TYPES.get(doc_name)
+                if doc_type is None:
+                    continue
+                doc = self.document.process_document(doc_type)
+                processed.append({
+                    "document_id": doc.document_id,
+                    "type": doc.document_type.value,
+                    "status": doc.authenticity_status.value,
+                    "confidence": doc.extraction_result.confidence if doc.extraction_result else 0,
+                })
+
+            state.documents_processed = processed
+            self._emit(state, PipelineStage.DOCUMENTS,
+                       f"Processed {len(processed)} documents",
+                       data={"documents": processed})
+        except Exception as exc:
+            self._emit(state, PipelineStage.DOCUMENTS, str(exc), success=False)
+        return state
+
+    async def _run_document_stage_async(
+        self, state: PipelineState, citizen: CitizenProfile
+    ) -> PipelineState:
+        """Document stage with per-document fan-out: each extraction runs
+        on a worker thread, gathered under a small concurrency cap."""
+        state.current_stage = PipelineStage.DOCUMENTS
+        clock.refresh()  # one clock read shared by this stage's stamps
+        try:
+            doc_names = (citizen.documents or ["aadhaar", "income_certificate"])[:5]
+            doc_types = [
+                t for name in doc_names
+                if (t := _VALID_DOC_TYPES.get(name)) is not None
+            ]
+
+            sem = asyncio.Semaphore(4)
+
+            async def _process(doc_type: DocumentType):
+                async with sem:
+                    return await asyncio.to_thread(
+                        self.document.process_document, doc_type
+                    )
+
+            # gather preserves input order, so the result rows match the
+            # sequential stage exactly
+            docs = await asyncio.gather(*(_process(t) for t in doc_types))
+            processed = [
+                {
+                    "document_id": doc.document_id,
+                    "type": doc.document_type.value,
+                    "status": doc.authenticity_status.value,
+                    "confidence": doc.extraction_result.confidence if doc.extraction_result else 0,
+                }
+                for doc in docs
+            ]
 
             state.documents_processed = processed
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.DOCUMENTS,
-                message=f"Processed {len(processed)} documents",
-                data={"documents": processed},
-            ))
+            self._emit(state, PipelineStage.DOCUMENTS,
+                       f"Processed {len(processed)} documents",
+                       data={"documents": processed})
         except Exception as exc:
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.DOCUMENTS, message=str(exc), success=False
-            ))
+            self._emit(state, PipelineStage.DOCUMENTS, str(exc), success=False)
         return state
 
     def _run_adversarial_stage(
         self, state: PipelineState, citizen: CitizenProfile, scheme_id: str
     ) -> PipelineState:
         state.current_stage = PipelineStage.ADVERSARIAL
+        clock.refresh()  # one clock read shared by this stage's stamps
         try:
             analysis = self.adversarial.predict_rejection(citizen, scheme_id)
             if analysis:
                 state.rejection_analysis = analysis.model_dump()
-                state.events.append(PipelineEvent(
-                    stage=PipelineStage.ADVERSARIAL,
-                    message=f"Rejection risk: {analysis.risk_level} ({analysis.rejection_probability:.0%})",
-                    data={
-                        "rejection_probability": analysis.rejection_probability,
-                        "risk_level": analysis.risk_level,
-                    },
-                ))
+                self._emit(state, PipelineStage.ADVERSARIAL,
+                           f"Rejection risk: {analysis.risk_level} ({analysis.rejection_probability:.0%})",
+                           data={
+                               "rejection_probability": analysis.rejection_probability,
+                               "risk_level": analysis.risk_level,
+                           })
         except Exception as exc:
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.ADVERSARIAL, message=str(exc), success=False
-            ))
+            self._emit(state, PipelineStage.ADVERSARIAL, str(exc), success=False)
+        return state
+
+    async def _run_adversarial_stage_async(
+        self, state: PipelineState, citizen: CitizenProfile, scheme_id: str
+    ) -> PipelineState:
+        state.current_stage = PipelineStage.ADVERSARIAL
+        clock.refresh()  # one clock read shared by this stage's stamps
+        try:
+            analysis = await self.adversarial.predict_rejection_async(citizen, scheme_id)
+            if analysis:
+                state.rejection_analysis = analysis.model_dump()
+                self._emit(state, PipelineStage.ADVERSARIAL,
+                           f"Rejection risk: {analysis.risk_level} ({analysis.rejection_probability:.0%})",
+                           data={
+                               "rejection_probability": analysis.rejection_probability,
+                               "risk_level": analysis.risk_level,
+                           })
+        except Exception as exc:
+            self._emit(state, PipelineStage.ADVERSARIAL, str(exc), success=False)
         return state
 
     def _run_execution_stage(
@@ -255,29 +419,81 @@ class OrchestratorAgent:
         scheme_id: str, rejection_prob: float
     ) -> PipelineState:
         state.current_stage = PipelineStage.EXECUTION
+        clock.refresh()  # one clock read shared by this stage's stamps
         try:
             app = self.execution.submit_application(
-                citizen, scheme_id, rejection_prob
+                citizen, scheme_id, rejection_prob,
+                scheme=state._selected_scheme,
             )
             state.application = app.model_dump()
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.EXECUTION,
-                message=f"Application {app.application_id}: {app.status.value}",
-                data={
-                    "application_id": app.application_id,
-                    "status": app.status.value,
-                    "confirmation": app.confirmation_number,
-                },
-            ))
+            self._emit(state, PipelineStage.EXECUTION,
+                       f"Application {app.application_id}: {app.status.value}",
+                       data={
+                           "application_id": app.application_id,
+                           "status": app.status.value,
+                           "confirmation": app.confirmation_number,
+                       })
         except Exception as exc:
-            state.events.append(PipelineEvent(
-                stage=PipelineStage.EXECUTION, message=str(exc), success=False
-            ))
+            self._emit(state, PipelineStage.EXECUTION, str(exc), success=False)
+        return state
+
+    async def _run_execution_stage_async(
+        self, state: PipelineState, citizen: CitizenProfile,
+        scheme_id: str, rejection_prob: float
+    ) -> PipelineState:
+        state.current_stage = PipelineStage.EXECUTION
+        clock.refresh()  # one clock read shared by this stage's stamps
+        try:
+            app = await self.execution.submit_application_async(
+                citizen, scheme_id, rejection_prob,
+                scheme=state._selected_scheme,
+            )
+            state.application = app.model_dump()
+            self._emit(state, PipelineStage.EXECUTION,
+                       f"Application {app.application_id}: {app.status.value}",
+                       data={
+                           "application_id": app.application_id,
+                           "status": app.status.value,
+                           "confirmation": app.confirmation_number,
+                       })
+        except Exception as exc:
+            self._emit(state, PipelineStage.EXECUTION, str(exc), success=False)
         return state
 
     # ── Helpers ───────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _emit(
+        state: PipelineState,
+        stage: PipelineStage,
+        message: str,
+        data: dict | None = None,
+        success: bool = True,
+    ) -> None:
+        """Buffer a raw event dict; materialized once in _flush_events."""
+        state._event_buffer.append({
+            "stage": stage,
+            "timestamp": clock.now_iso(),
+            "message": message,
+            "data": data or {},
+            "success": success,
+        })
+
+    @staticmethod
+    def _flush_events(state: PipelineState) -> None:
+        """Turn buffered dicts into PipelineEvents in one pass.
+        model_construct skips validation — the orchestrator owns the inputs."""
+        if state._event_buffer:
+            overflow = len(state.events) + len(state._event_buffer) - MAX_EVENTS
+            if overflow > 0:
+                state.events_truncated += overflow
+            state.events.extend(
+                PipelineEvent.model_construct(**d) for d in state._event_buffer
+            )
+            state._event_buffer.clear()
+
     def _finalize(self, state: PipelineState) -> PipelineState:
+        self._flush_events(state)
         _pipelines[state.pipeline_id] = state
         return state
 
@@ -286,9 +502,13 @@ class OrchestratorAgent:
 
     def handle_agent_error(self, state: PipelineState, stage: str, error: str) -> PipelineState:
         """Handle an agent error (Req 9.4, 9.5)."""
-        state.events.append(PipelineEvent(
-            stage=PipelineStage(stage),
-            message=f"Error in {stage}: {error}",
-            success=False,
-        ))
+        message = f"Error in {stage}: {error}"
+        # Coalesce: a retry loop re-reporting the same failure should not
+        # flood the ring buffer with identical entries
+        if state.events:
+            last = state.events[-1]
+            if last.stage == stage and last.message == message:
+                return state
+        self._emit(state, PipelineStage(stage), message, success=False)
+        self._flush_events(state)
         return state
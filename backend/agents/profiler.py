@@ -6,15 +6,25 @@ DigiLocker simulation, and GDPR-compliant data deletion.
 
 from __future__ import annotations
 
-import uuid
-from datetime import datetime
-
+from backend.util import clock
+from backend.util.ids import short_id
+from backend.store.kv import ShardedStore
 from backend.models.citizen import CitizenProfile, Address, Gender, CasteCategory, EducationLevel, Occupation
 from backend.models.document import Document, DocumentType, ExtractionResult
+from backend.knowledge.schemes_data import docs_to_bits
+
+
+# In-memory citizen store (DynamoDB sim) — sharded, bounded, thread-safe
+_citizens: ShardedStore = ShardedStore()
 
+# Address is a plain slotted dataclass and rejects unknown keys; client
+# payloads may carry extras (landmark, etc.), so keep only known fields
+_ADDRESS_FIELDS: frozenset[str] = frozenset(Address.__dataclass_fields__)
 
-# In-memory citizen store (DynamoDB sim)
-_citizens: dict[str, CitizenProfile] = {}
+
+def _build_address(data: dict) -> Address:
+    """Address from an untrusted payload dict, ignoring extra keys."""
+    return Address(**{k: v for k, v in data.items() if k in _ADDRESS_FIELDS})
 
 
 class ProfilerAgent:
@@ -22,10 +32,10 @@ class ProfilerAgent:
 
     def create_profile(self, data: dict) -> CitizenProfile:
         """Create a new citizen profile from form data (Req 1.1)."""
-        citizen_id = f"CIT-{uuid.uuid4().hex[:8].upper()}"
+        citizen_id = short_id("CIT")
 
         address_data = data.get("address", {})
-        address = Address(**address_data) if isinstance(address_data, dict) else Address()
+        address = _build_address(address_data) if isinstance(address_data, dict) else Address()
 
         profile = CitizenProfile(
             citizen_id=citizen_id,
@@ -54,6 +64,7 @@ class ProfilerAgent:
             consent_retention=data.get("consent_retention", False),
         )
 
+        profile._docs_bitmask = docs_to_bits(profile.documents)
         _citizens[citizen_id] = profile
         return profile
 
@@ -65,11 +76,14 @@ class ProfilerAgent:
 
         for key, value in updates.items():
             if key == "address" and isinstance(value, dict):
-                profile.address = Address(**value)
+                profile.address = _build_address(value)
             elif hasattr(profile, key):
                 setattr(profile, key, value)
 
-        profile.updated_at = datetime.now().isoformat()
+        profile.updated_at = clock.now_iso()
+        profile._docs_bitmask = docs_to_bits(profile.documents)
+        if "family_members" in updates:
+            profile._drop_family_cache()
         _citizens[citizen_id] = profile
         return profile
 
@@ -127,27 +141,31 @@ class ProfilerAgent:
         Detect and resolve conflicts between existing profile and new data.
         Returns conflict report (Req 1.4).
         """
-        conflicts: list[dict] = []
-        merged: dict = {}
-
-        for key, new_val in new_data.items():
-            if key in ("citizen_id", "created_at"):
-                continue
-            old_val = getattr(profile, key, None)
-            if old_val and old_val != new_val and new_val:
-                conflicts.append({
-                    "field": key,
-                    "existing_value": str(old_val),
-                    "new_value": str(new_val),
-                    "resolution": "new_value_preferred",
-                })
-                merged[key] = new_val
-            elif new_val:
-                merged[key] = new_val
+        # Pydantic v2 keeps field values in __dict__ — reading it directly
+        # skips the model __getattr__ machinery, and the key intersection
+        # bounds the conflict scan to fields that actually overlap
+        existing = profile.__dict__
+        common = new_data.keys() & existing.keys() - {"citizen_id", "created_at"}
+
+        conflicts = [
+            {
+                "field": key,
+                "existing_value": str(old_val),
+                "new_value": str(new_val),
+                "resolution": "new_value_preferred",
+            }
+            for key in common
+            if (new_val := new_data[key]) and (old_val := existing[key]) and old_val != new_val
+        ]
+        merged = {
+            key: new_val
+            for key, new_val in new_data.items()
+            if new_val and key not in ("citizen_id", "created_at")
+        }
 
         return {
             "conflicts": conflicts,
-            "has_conflicts": len(conflicts) > 0,
+            "has_conflicts": bool(conflicts),
             "merged_updates": merged,
         }
 
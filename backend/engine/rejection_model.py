@@ -6,37 +6,81 @@ rejection probability (Req 4).
 
 from __future__ import annotations
 
-import random
+from backend.util.rng import next_uniform
 from backend.models.citizen import CitizenProfile
 from backend.models.scheme import Scheme
+from backend.knowledge.schemes_data import SCHEMES, docs_to_bits, rule_scalars
 
 
-def _encode_features(citizen: CitizenProfile, scheme: Scheme) -> list[float]:
+# Feature weights for the simulated model (aligned with _encode_features order)
+_WEIGHTS = (0.30, 0.15, 0.10, 0.15, 0.10, 0.15, 0.05)
+
+
+def _scheme_static(scheme: Scheme) -> tuple[int, int, float | None, tuple[int, ...], float]:
+    """Citizen-independent scheme features, derived once per scheme.
+    Returns (required_docs_bits, total_docs, income_max, age_limits, approval_rate)."""
+    cached = _SCHEME_STATIC.get(scheme.scheme_id)
+    if cached is None:
+        income_max, age_limits = rule_scalars(scheme)
+        cached = (
+            docs_to_bits(scheme.required_documents),
+            len(scheme.required_documents),
+            income_max,
+            age_limits,
+            scheme.approval_rate,
+        )
+        _SCHEME_STATIC[scheme.scheme_id] = cached
+    return cached
+
+
+# Warm the static-feature table for all known schemes at import
+_SCHEME_STATIC: dict[str, tuple[int, int, float | None, tuple[int, ...], float]] = {}
+for _scheme in SCHEMES:
+    _scheme_static(_scheme)
+del _scheme
+
+
+def _citizen_features(citizen: CitizenProfile) -> tuple[int, float, float, float]:
+    """Scheme-independent features — computed once per citizen in batch scoring."""
+    docs_bits = citizen._docs_bitmask
+    if docs_bits is None:
+        # Profiles built outside ProfilerAgent derive (and cache) lazily
+        docs_bits = citizen._docs_bitmask = docs_to_bits(citizen.documents)
+    return (
+        docs_bits,
+        1.0 if citizen.aadhaar_number else 0.0,
+        1.0 if citizen.bank_account else 0.0,
+        len(citizen.family_members) / 10.0,
+    )
+
+
+def _encode_features(
+    citizen: CitizenProfile,
+    scheme: Scheme,
+    citizen_feats: tuple[int, float, float, float] | None = None,
+) -> list[float]:
     """Encode citizen + scheme into a feature vector for prediction."""
-    missing_docs = len([
-        d for d in scheme.required_documents if d not in set(citizen.documents)
-    ])
-    total_docs = len(scheme.required_documents)
-    doc_completeness = 1.0 - (missing_docs / total_docs) if total_docs else 1.0
+    docs_bits, has_aadhaar, has_bank, family_ratio = (
+        citizen_feats if citizen_feats is not None else _citizen_features(citizen)
+    )
+    required_bits, total_docs, income_max, age_limits, approval_rate = (
+        _scheme_static(scheme)
+    )
 
-    has_aadhaar = 1.0 if citizen.aadhaar_number else 0.0
-    has_bank = 1.0 if citizen.bank_account else 0.0
+    # Documents required but not held: one AND + popcount
+    missing_docs = (required_bits & ~docs_bits).bit_count()
+    doc_completeness = 1.0 - (missing_docs / total_docs) if total_docs else 1.0
 
     income_ratio = 0.0
-    for rule in scheme.eligibility_rules:
-        if rule.rule_type.value == "income_max":
-            max_val = float(rule.value)
-            income_ratio = citizen.annual_income / max_val if max_val else 0.0
-            break
+    if income_max is not None:
+        income_ratio = citizen.annual_income / income_max if income_max else 0.0
 
     age_risk = 0.0
     if citizen.age:
-        for rule in scheme.eligibility_rules:
-            if rule.rule_type.value in ("age_min", "age_max"):
-                limit = int(rule.value)
-                diff = abs(citizen.age - limit)
-                if diff <= 2:
-                    age_risk = 1.0 - diff * 0.3
+        for limit in age_limits:
+            diff = abs(citizen.age - limit)
+            if diff <= 2:
+                age_risk = 1.0 - diff * 0.3
 
     return [
         doc_completeness,
@@ -44,8 +88,8 @@ def _encode_features(citizen: CitizenProfile, scheme: Scheme) -> list[float]:
         has_bank,
         income_ratio,
         age_risk,
-        scheme.approval_rate,
-        len(citizen.family_members) / 10.0,
+        approval_rate,
+        family_ratio,
     ]
 
 
@@ -56,15 +100,60 @@ def predict_rejection_probability(
     Simulate an XGBoost model predicting rejection probability.
     In production, this calls SageMaker; for demo it uses weighted features.
     """
-    features = _encode_features(citizen, scheme)
+    return predict_rejection_probability_batch(citizen, [scheme])[0]
+
+
+def predict_rejection_probability_batch(
+    citizen: CitizenProfile, schemes: list[Scheme]
+) -> list[float]:
+    """
+    Score one citizen against many schemes.
+    The citizen-constant features are encoded once and shared across the
+    batch instead of being re-derived per scheme.
+    """
+    citizen_feats = _citizen_features(citizen)
+    return [
+        _score(_encode_features(citizen, scheme, citizen_feats))
+        for scheme in schemes
+    ]
+
+
+def _weighted_score(features: list[float]) -> float:
+    """Dot product of the feature vector with the model weights."""
+    return sum(f * w for f, w in zip(features, _WEIGHTS))
+
+
+try:
+    # Optional JIT path: when numba (and numpy) are installed the scoring
+    # kernel is compiled and warmed at import; otherwise the pure-Python
+    # _weighted_score above is used. Neither is a hard dependency.
+    import numpy as _np
+    from numba import njit as _njit
+
+    _WEIGHTS_ARR = _np.asarray(_WEIGHTS, dtype=_np.float32)
+
+    @_njit(cache=True, fastmath=True)
+    def _dot_kernel(features, weights):  # pragma: no cover - numba-compiled
+        total = 0.0
+        for i in range(features.shape[0]):
+            total += features[i] * weights[i]
+        return total
+
+    def _weighted_score(features: list[float]) -> float:  # noqa: F811
+        return float(_dot_kernel(_np.asarray(features, dtype=_np.float32), _WEIGHTS_ARR))
+
+    # Warm the JIT cache so the first real prediction doesn't pay compile cost
+    _dot_kernel(_np.zeros(len(_WEIGHTS), dtype=_np.float32), _WEIGHTS_ARR)
+except ImportError:
+    pass
 
-    weights = [0.30, 0.15, 0.10, 0.15, 0.10, 0.15, 0.05]
 
+def _score(features: list[float]) -> float:
     # The score is the complementary risk aggregate
-    positive_score = sum(f * w for f, w in zip(features, weights))
+    positive_score = _weighted_score(features)
 
     # Add a tiny random factor to simulate real model variance
-    noise = random.uniform(-0.03, 0.03)
+    noise = 0.06 * next_uniform() - 0.03
     rejection_prob = max(0.0, min(1.0, 1.0 - positive_score + noise))
 
     return round(rejection_prob, 3)
@@ -5,13 +5,16 @@ Evaluates applications against known rejection patterns (Req 4).
 
 from __future__ import annotations
 
+from typing import Callable
+
 from backend.models.citizen import CitizenProfile
 from backend.models.scheme import Scheme
 from backend.models.application import RejectionAnalysis
+from backend.knowledge.schemes_data import SCHEME_RULE_SCALARS, docs_to_bits, rule_scalars
 
 
 # Common government rejection patterns sourced from RTI data
-REJECTION_PATTERNS: list[dict] = [
+REJECTION_PATTERNS: tuple[dict, ...] = (
     {
         "id": "incomplete_docs",
         "name": "Incomplete Documentation",
@@ -54,12 +57,18 @@ REJECTION_PATTERNS: list[dict] = [
         "weight": 0.05,
         "description": "Caste certificate older than 6 months",
     },
-]
+)
+
+# Constant on the request path — built once instead of per call
+_TOP3_PATTERN_NAMES = tuple(p["name"] for p in REJECTION_PATTERNS[:3])
 
 
 def _check_missing_docs(citizen: CitizenProfile, scheme: Scheme) -> list[str]:
-    """Return list of missing required documents."""
+    """Return list of missing required documents (in requirement order)."""
     citizen_docs = set(citizen.documents)
+    # Common case — everything present — is one C-level subset check
+    if scheme.required_documents_set <= citizen_docs:
+        return []
     return [d for d in scheme.required_documents if d not in citizen_docs]
 
 
@@ -75,11 +84,17 @@ def predict_rejection(
     risk_factors: list[dict] = []
     total_risk: float = 0.0
 
+    # Numeric rule limits resolved via the prebuilt index — no per-call
+    # scan over eligibility_rules (unknown schemes derive them inline)
+    scalars = SCHEME_RULE_SCALARS.get(scheme.scheme_id)
+    income_max, age_limits = scalars if scalars is not None else rule_scalars(scheme)
+
     # 1. Incomplete documentation
     missing = _check_missing_docs(citizen, scheme)
     if missing:
         factor_risk = 0.30 * (len(missing) / max(len(scheme.required_documents), 1))
         risk_factors.append({
+            "factor_id": "docs",
             "factor": "Incomplete Documentation",
             "severity": "high" if len(missing) > 2 else "medium",
             "details": f"Missing documents: {', '.join(missing)}",
@@ -88,24 +103,23 @@ def predict_rejection(
         total_risk += factor_risk
 
     # 2. Income verification risk
-    if citizen.annual_income > 0:
-        for rule in scheme.eligibility_rules:
-            if rule.rule_type.value == "income_max":
-                max_income = float(rule.value)
-                ratio = citizen.annual_income / max_income if max_income else 0
-                if ratio > 0.85:
-                    factor_risk = 0.20 * min(ratio - 0.85, 0.15) / 0.15
-                    risk_factors.append({
-                        "factor": "Income Near Threshold",
-                        "severity": "high" if ratio > 0.95 else "medium",
-                        "details": f"Income ₹{citizen.annual_income:,.0f} is {ratio*100:.0f}% of max ₹{max_income:,.0f}",
-                        "risk_contribution": round(factor_risk, 2),
-                    })
-                    total_risk += factor_risk
+    if citizen.annual_income > 0 and income_max is not None:
+        ratio = citizen.annual_income / income_max if income_max else 0
+        if ratio > 0.85:
+            factor_risk = 0.20 * min(ratio - 0.85, 0.15) / 0.15
+            risk_factors.append({
+                "factor_id": "income",
+                "factor": "Income Near Threshold",
+                "severity": "high" if ratio > 0.95 else "medium",
+                "details": f"Income ₹{citizen.annual_income:,.0f} is {ratio*100:.0f}% of max ₹{income_max:,.0f}",
+                "risk_contribution": round(factor_risk, 2),
+            })
+            total_risk += factor_risk
 
     # 3. Aadhaar presence check
     if not citizen.aadhaar_number:
         risk_factors.append({
+            "factor_id": "aadhaar",
             "factor": "Missing Aadhaar",
             "severity": "critical",
             "details": "Aadhaar number not provided — required for DBT",
@@ -116,6 +130,7 @@ def predict_rejection(
     # 4. Bank account verification
     if not citizen.bank_account:
         risk_factors.append({
+            "factor_id": "bank",
             "factor": "No Bank Account Linked",
             "severity": "high",
             "details": "Bank account needed for benefit disbursement via DBT",
@@ -125,18 +140,17 @@ def predict_rejection(
 
     # 5. Age boundary risk
     if citizen.age:
-        for rule in scheme.eligibility_rules:
-            if rule.rule_type.value in ("age_min", "age_max"):
-                limit = int(rule.value)
-                diff = abs(citizen.age - limit)
-                if diff <= 1:
-                    risk_factors.append({
-                        "factor": "Age Boundary Risk",
-                        "severity": "medium",
-                        "details": f"Age {citizen.age} is at the boundary of limit {limit}",
-                        "risk_contribution": 0.08,
-                    })
-                    total_risk += 0.08
+        for limit in age_limits:
+            diff = abs(citizen.age - limit)
+            if diff <= 1:
+                risk_factors.append({
+                    "factor_id": "age",
+                    "factor": "Age Boundary Risk",
+                    "severity": "medium",
+                    "details": f"Age {citizen.age} is at the boundary of limit {limit}",
+                    "risk_contribution": 0.08,
+                })
+                total_risk += 0.08
 
     # 6. Base risk from scheme's historical rejection rate
     base_rejection = 1 - scheme.approval_rate
@@ -163,10 +177,92 @@ def predict_rejection(
         risk_level=risk_level,
         risk_factors=risk_factors,
         recommendations=recommendations,
-        common_rejection_patterns=[p["name"] for p in REJECTION_PATTERNS[:3]],
+        common_rejection_patterns=list(_TOP3_PATTERN_NAMES),
     )
 
 
+def predict_rejection_batch(
+    citizens: list[CitizenProfile], schemes: list[Scheme]
+) -> list[list[float]]:
+    """
+    Score every citizen against every scheme in one pass.
+    Returns a citizens × schemes grid of rejection probabilities. Citizen
+    and scheme features are hoisted into parallel tuples outside the double
+    loop, and no risk-factor dicts are materialized — callers wanting the
+    detailed breakdown run predict_rejection on the pairs they care about.
+    """
+    scheme_feats = [
+        (
+            docs_to_bits(s.required_documents),
+            max(len(s.required_documents), 1),
+            *(SCHEME_RULE_SCALARS.get(s.scheme_id) or rule_scalars(s)),
+            (1 - s.approval_rate) * 0.3,
+        )
+        for s in schemes
+    ]
+    citizen_feats = [
+        (
+            docs_to_bits(c.documents),
+            c.annual_income,
+            c.age,
+            0.0 if c.aadhaar_number else 0.25,
+            0.0 if c.bank_account else 0.15,
+        )
+        for c in citizens
+    ]
+
+    grid: list[list[float]] = []
+    for docs_bits, income, age, aadhaar_risk, bank_risk in citizen_feats:
+        row: list[float] = []
+        for req_bits, n_docs, income_max, age_limits, base_risk in scheme_feats:
+            # Accumulation order mirrors predict_rejection so the floats
+            # (and their rounding) agree exactly
+            total = 0.0
+
+            missing = (req_bits & ~docs_bits).bit_count()
+            if missing:
+                total += 0.30 * (missing / n_docs)
+
+            if income > 0 and income_max:
+                ratio = income / income_max
+                if ratio > 0.85:
+                    total += 0.20 * min(ratio - 0.85, 0.15) / 0.15
+
+            total += aadhaar_risk
+            total += bank_risk
+
+            if age:
+                for limit in age_limits:
+                    if abs(age - limit) <= 1:
+                        total += 0.08
+
+            total += base_risk
+            row.append(round(min(max(total, 0.0), 1.0), 2))
+        grid.append(row)
+    return grid
+
+
+# Recommendation generators dispatched on the stable factor_id each risk
+# factor carries — no substring scans over display names
+_RECOMMENDERS: dict[str, Callable[[list[str]], list[str]]] = {
+    "docs": lambda missing: [
+        f"Upload your {doc.replace('_', ' ')} before submitting" for doc in missing
+    ],
+    "aadhaar": lambda missing: [
+        "Link your Aadhaar number — this is mandatory for Direct Benefit Transfer"
+    ],
+    "bank": lambda missing: [
+        "Open a Jan Dhan account if you don't have one — it's zero-balance and free"
+    ],
+    "income": lambda missing: [
+        "Ensure income certificate matches your actual declared income to avoid mismatch"
+    ],
+    "age": lambda missing: [
+        "Submit application before your birthdate crosses the age cutoff"
+    ],
+}
+
+
 def _generate_recommendations(
     risk_factors: list[dict], missing_docs: list[str]
 ) -> list[str]:
@@ -174,18 +270,9 @@ def _generate_recommendations(
     recs: list[str] = []
 
     for factor in risk_factors:
-        name = factor["factor"]
-        if "Documentation" in name:
-            for doc in missing_docs:
-                recs.append(f"Upload your {doc.replace('_', ' ')} before submitting")
-        elif "Aadhaar" in name:
-            recs.append("Link your Aadhaar number — this is mandatory for Direct Benefit Transfer")
-        elif "Bank" in name:
-            recs.append("Open a Jan Dhan account if you don't have one — it's zero-balance and free")
-        elif "Income" in name:
-            recs.append("Ensure income certificate matches your actual declared income to avoid mismatch")
-        elif "Age" in name:
-            recs.append("Submit application before your birthdate crosses the age cutoff")
+        generate = _RECOMMENDERS.get(factor.get("factor_id", ""))
+        if generate:
+            recs.extend(generate(missing_docs))
 
     # Dedup
     return list(dict.fromkeys(recs))
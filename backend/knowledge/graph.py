@@ -1,20 +1,32 @@
 """
-NetworkX-based knowledge graph simulating Amazon Neptune.
-Builds a scheme–rule–document graph and supports multi-hop traversals,
-conflict detection, and benefit-chain discovery (Req 2, 8).
+Knowledge graph simulating Amazon Neptune.
+Flat lookup tables (compiled rule predicates, CSR dependency arrays,
+conflict bitmasks) serve the hot paths — multi-hop traversals, conflict
+detection, and benefit-chain discovery (Req 2, 8). A NetworkX view is
+materialized lazily for diagnostics only.
 """
 
 from __future__ import annotations
 
-import networkx as nx
-from typing import Optional
+import operator
 
-from backend.models.citizen import CitizenProfile, EducationLevel
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
+
+from backend.models.citizen import CasteCategory, CitizenProfile, EducationLevel, Gender, Occupation
 from backend.models.scheme import Scheme, EligibilityRule, RuleType, SchemeMatch
-from backend.knowledge.schemes_data import SCHEMES, SCHEME_MAP
+from backend.knowledge.schemes_data import (
+    SCHEME_DEPENDENTS_CLOSURE,
+    SCHEME_DEPS_CLOSURE,
+    SCHEME_MAP,
+    SCHEMES,
+)
 
 
-# Education level ordering for comparisons
+# Education level ordering for comparisons (rule values are raw strings;
+# used only at predicate-compile time — packed citizens carry
+# EducationLevel.order)
 _EDU_ORDER: dict[str, int] = {
     "none": 0,
     "primary": 1,
@@ -25,208 +37,659 @@ _EDU_ORDER: dict[str, int] = {
     "doctorate": 6,
 }
 
-MAX_HOPS = 5  # Req 2.5: multi-hop traversal limit
+MAX_HOPS = 5
+
+# Shared empty answer for unknown scheme IDs in closure lookups
+_EMPTY_IDS: frozenset[str] = frozenset()  # Req 2.5: multi-hop traversal limit
+
+# Rule values arrive as raw strings; resolve them to the small-int codes
+# stamped on the enums once at predicate-compile time. Unknown tokens map
+# to -1 / drop out, which (like the old string compares) can never match.
+_GENDER_CODE: dict[str, int] = {g.value: g.code for g in Gender}
+_CASTE_CODE: dict[str, int] = {c.value: c.code for c in CasteCategory}
+_OCC_CODE: dict[str, int] = {o.value: o.code for o in Occupation}
+_SC_ST_CODES = frozenset((CasteCategory.SC.code, CasteCategory.ST.code))
+_FEMALE_CODE = Gender.FEMALE.code
+
+# Sentinel min-child-age for citizens with no children: fails every
+# child_age_max rule
+_NO_CHILD = 1 << 30
+
+
+class CitizenBatch:
+    """Struct-of-arrays view of many citizens for bulk eligibility scans.
+    Packing happens once per citizen at construction; bulk evaluation then
+    runs compiled predicates over plain tuples of CitizenVec — no Pydantic
+    descriptor traffic inside the citizens × schemes × rules loops."""
+
+    __slots__ = ("vecs", "docs")
+
+    def __init__(self, vecs: tuple[CitizenVec, ...], docs: tuple[frozenset[str], ...]):
+        self.vecs = vecs
+        self.docs = docs
+
+    @classmethod
+    def from_profiles(cls, profiles: list[CitizenProfile]) -> "CitizenBatch":
+        return cls(
+            tuple(_pack_citizen(p) for p in profiles),
+            tuple(frozenset(p.documents) for p in profiles),
+        )
+
+    def __len__(self) -> int:
+        return len(self.vecs)
+
+
+class CitizenVec(NamedTuple):
+    """Citizen fields the rule predicates read, packed once per evaluation
+    run — rules touch plain tuple slots instead of re-walking Pydantic
+    attributes, enum .values, and family_members per rule."""
+    age: int
+    income: float
+    gender: int  # Gender.code
+    caste: int  # CasteCategory.code
+    state: str  # lowercased
+    occupation: int  # Occupation.code
+    edu_rank: int
+    is_bpl: bool
+    is_disabled: bool
+    is_pregnant: bool
+    is_minority: bool
+    num_children: int
+    num_daughters: int
+    min_child_age: int
+
+
+def _pack_citizen(citizen: CitizenProfile) -> CitizenVec:
+    """Flatten a profile into a CitizenVec (one pass over family_members)."""
+    num_children = num_daughters = 0
+    min_child_age = _NO_CHILD
+    for m in citizen.family_members:
+        if m.relationship == "child":
+            num_children += 1
+            if m.gender.value == "female":
+                num_daughters += 1
+            if m.age < min_child_age:
+                min_child_age = m.age
+    return CitizenVec(
+        age=citizen.age or 0,
+        income=citizen.annual_income,
+        gender=citizen.gender.code,
+        caste=citizen.caste_category.code,
+        state=citizen.address.state.lower(),
+        occupation=citizen.occupation.code,
+        edu_rank=citizen.education.order,
+        is_bpl=citizen.is_bpl,
+        is_disabled=citizen.is_disabled,
+        is_pregnant=citizen.is_pregnant,
+        is_minority=citizen.is_minority,
+        num_children=num_children,
+        num_daughters=num_daughters,
+        min_child_age=min_child_age,
+    )
+
+
+def _make_age_min(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    age_min = int(rule.value)
+    return lambda v: v.age >= age_min
+
+
+def _make_age_max(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    age_max = int(rule.value)
+    return lambda v: v.age <= age_max
+
+
+def _make_income_max(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    income_max = float(rule.value)
+    return lambda v: v.income <= income_max
+
+
+def _make_gender(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    code = _GENDER_CODE.get(rule.value, -1)
+    return lambda v: v.gender == code
+
+
+def _make_caste(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    allowed = frozenset(
+        _CASTE_CODE[x] for x in (t.strip() for t in rule.value.split(","))
+        if x in _CASTE_CODE
+    )
+    return lambda v: v.caste in allowed
+
+
+def _make_state(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    state = rule.value.lower()
+    return lambda v: v.state == state
+
+
+def _make_occupation(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    allowed = frozenset(
+        _OCC_CODE[x] for x in (t.strip() for t in rule.value.split(","))
+        if x in _OCC_CODE
+    )
+    return lambda v: v.occupation in allowed
+
+
+def _make_education_min(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    edu_min = _EDU_ORDER.get(rule.value, 0)
+    return lambda v: v.edu_rank >= edu_min
+
+
+def _make_education_max(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    edu_max = _EDU_ORDER.get(rule.value, 0)
+    return lambda v: v.edu_rank <= edu_max
+
+
+def _make_child_age_max(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    child_age_max = int(rule.value)
+    return lambda v: v.min_child_age <= child_age_max
+
+
+def _make_sc_st_or_female(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    return lambda v: v.caste in _SC_ST_CODES or v.gender == _FEMALE_CODE
+
+
+def _make_custom(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    factory = _CUSTOM_FACTORIES.get(rule.condition)
+    return factory(rule) if factory else (lambda v: False)
+
+
+# CUSTOM rules sub-dispatch on their condition string
+_CUSTOM_FACTORIES: dict[str, Callable[[EligibilityRule], Callable[[CitizenVec], bool]]] = {
+    "child_age_max": _make_child_age_max,
+    "sc_st_or_female": _make_sc_st_or_female,
+}
+
+# Predicate factories keyed by rule type — compilation is one dict lookup,
+# and each factory parses the rule value (casts, comma-splits, lowercasing)
+# exactly once before closing over the result
+_RULE_FACTORIES: dict[RuleType, Callable[[EligibilityRule], Callable[[CitizenVec], bool]]] = {
+    RuleType.AGE_MIN: _make_age_min,
+    RuleType.AGE_MAX: _make_age_max,
+    RuleType.INCOME_MAX: _make_income_max,
+    RuleType.GENDER: _make_gender,
+    RuleType.CASTE: _make_caste,
+    RuleType.STATE: _make_state,
+    RuleType.OCCUPATION: _make_occupation,
+    RuleType.EDUCATION_MIN: _make_education_min,
+    RuleType.EDUCATION_MAX: _make_education_max,
+    RuleType.BPL: lambda rule: lambda v: v.is_bpl,
+    RuleType.DISABILITY: lambda rule: lambda v: v.is_disabled,
+    RuleType.PREGNANT: lambda rule: lambda v: v.is_pregnant,
+    RuleType.HAS_CHILDREN: lambda rule: lambda v: v.num_children > 0,
+    RuleType.HAS_DAUGHTERS: lambda rule: lambda v: v.num_daughters > 0,
+    RuleType.MINORITY: lambda rule: lambda v: v.is_minority,
+    RuleType.CUSTOM: _make_custom,
+}
+
+
+def _compile_rule(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    """Compile a rule into a predicate closure via the factory table.
+    Unknown rule types compile to an always-False predicate, matching the
+    old if-chain's fallthrough."""
+    factory = _RULE_FACTORIES.get(rule.rule_type)
+    return factory(rule) if factory else (lambda v: False)
+
+
+# Compiled predicates keyed by the fields the factories actually read —
+# rule_id defaults to "" and would alias distinct ad-hoc rules. Identical
+# rules from different schemes share one closure as a bonus.
+_RULE_PREDICATES: dict[tuple[RuleType, str, str], Callable[[CitizenVec], bool]] = {}
+
+
+def _compiled_predicate(rule: EligibilityRule) -> Callable[[CitizenVec], bool]:
+    key = (rule.rule_type, rule.condition, rule.value)
+    pred = _RULE_PREDICATES.get(key)
+    if pred is None:
+        pred = _RULE_PREDICATES[key] = _compile_rule(rule)
+    return pred
 
 
 class SchemeGraph:
-    """Scheme knowledge graph — Neptune simulation using NetworkX."""
+    """Scheme knowledge graph — Neptune simulation over flat lookup tables."""
 
     def __init__(self) -> None:
-        self.graph = nx.DiGraph()
+        # NetworkX view, built lazily by the `graph` property — nothing on
+        # the request path touches it
+        self._nx_graph: nx.DiGraph | None = None
+        # scheme_id -> [(rule_label, predicate)] with labels resolved and
+        # predicates compiled once at build time
+        self._compiled_rules: dict[str, list[tuple[str, Callable[[CitizenVec], bool]]]] = {}
+        # Dense predicate rows indexed by scheme position in SCHEMES —
+        # the label-free flattened rule table the bulk scans iterate
+        self._pred_rows: tuple[tuple[Callable[[CitizenVec], bool], ...], ...] = ()
+        # CSR-style reverse DEPENDS_ON adjacency over dense scheme indices,
+        # built by _build — benefit-chain BFS walks contiguous index slices
+        # instead of NetworkX predecessor + edge-attribute lookups
+        self._id_to_idx: dict[str, int] = {}
+        self._idx_to_id: list[str] = []
+        self._dep_indptr: list[int] = []
+        self._dep_neighbors: list[int] = []
+        # Full-depth benefit chains, precomputed per scheme — the dependency
+        # structure is static, so discover_schemes reads instead of re-BFSing
+        self._unlocks_cache: dict[str, tuple[str, ...]] = {}
+        # Per-scheme conflict bitmask over dense scheme indices — conflicts
+        # within a selection reduce to an AND against the selection mask
+        self._conflict_masks: dict[str, int] = {}
+        # Warm-repeat discovery cache — interactive flows re-score the same
+        # citizen after single-field edits, and the rule tables are static
+        # for the process lifetime. Bound per instance so the graph itself
+        # is never pinned by a class-level cache.
+        self._discover_cached = lru_cache(maxsize=1024)(self._evaluate_all)
+
         self._build()
 
     # ── Graph Construction ───────────────────────────────────────────────
 
     def _build(self) -> None:
-        """Build the full graph from scheme data."""
-        for scheme in SCHEMES:
-            # Scheme node
-            self.graph.add_node(
-                scheme.scheme_id,
-                node_type="scheme",
-                name=scheme.name,
-                category=scheme.category.value,
-                benefit=scheme.benefit_amount,
-            )
+        """Build the flat lookup tables from scheme data."""
+        doc_nodes: set[str] = set()
+        scheme_pair_edges: set[tuple[str, str]] = set()
+        rule_count = 0
+        doc_edge_count = 0
 
-            # Rule nodes + edges
-            for rule in scheme.eligibility_rules:
-                rule_node = f"rule_{rule.rule_id}"
-                self.graph.add_node(
-                    rule_node,
-                    node_type="rule",
-                    rule_type=rule.rule_type.value,
-                    condition=rule.condition,
-                    value=rule.value,
-                )
-                self.graph.add_edge(scheme.scheme_id, rule_node, relation="REQUIRES")
+        for scheme in SCHEMES:
+            # Compiled rule table for the evaluation hot path
+            self._compiled_rules[scheme.scheme_id] = [
+                (rule.description or rule.rule_id, _compiled_predicate(rule))
+                for rule in scheme.eligibility_rules
+            ]
+            rule_count += len(scheme.eligibility_rules)
 
-            # Document nodes + edges
             for doc in scheme.required_documents:
-                doc_node = f"doc_{doc}"
-                if not self.graph.has_node(doc_node):
-                    self.graph.add_node(doc_node, node_type="document", doc_type=doc)
-                self.graph.add_edge(scheme.scheme_id, doc_node, relation="NEEDS_DOCUMENT")
+                doc_nodes.add(doc)
+                doc_edge_count += 1
 
-            # Dependency edges
             for dep_id in scheme.depends_on:
                 if dep_id in SCHEME_MAP:
-                    self.graph.add_edge(scheme.scheme_id, dep_id, relation="DEPENDS_ON")
+                    scheme_pair_edges.add((scheme.scheme_id, dep_id))
 
-            # Conflict edges
             for conflict_id in scheme.conflicts_with:
                 if conflict_id in SCHEME_MAP:
-                    self.graph.add_edge(scheme.scheme_id, conflict_id, relation="CONFLICTS_WITH")
-                    self.graph.add_edge(conflict_id, scheme.scheme_id, relation="CONFLICTS_WITH")
+                    scheme_pair_edges.add((scheme.scheme_id, conflict_id))
+                    scheme_pair_edges.add((conflict_id, scheme.scheme_id))
+
+        # Counters backing stats() — same node/edge accounting the old
+        # NetworkX graph produced
+        self._rule_count = rule_count
+        self._doc_count = len(doc_nodes)
+        self._edge_count = rule_count + doc_edge_count + len(scheme_pair_edges)
+
+        self._pred_rows = tuple(
+            tuple(pred for _label, pred in self._compiled_rules[s.scheme_id])
+            for s in SCHEMES
+        )
+
+        self._build_dependency_csr()
+        self._build_prefilter()
+
+    def _build_prefilter(self) -> None:
+        """RETE-style alpha index: for each discriminating rule kind, a
+        bitmask (or value → bitmask table) over dense scheme indices.
+        _candidate_mask folds a citizen's fields through these to drop
+        schemes with a definitely-failing rule before any predicate runs.
+        Only definite failures are excluded, so the index never changes
+        results — it only shrinks the candidate set."""
+        self._pf_flags: list[tuple[int, int]] = []  # (vec slot index, mask)
+        flag_masks = {
+            "is_bpl": 0, "is_pregnant": 0, "is_disabled": 0, "is_minority": 0,
+        }
+        count_slots = {RuleType.HAS_CHILDREN: "num_children",
+                       RuleType.HAS_DAUGHTERS: "num_daughters"}
+        count_masks = {"num_children": 0, "num_daughters": 0}
+        flag_types = {RuleType.BPL: "is_bpl", RuleType.PREGNANT: "is_pregnant",
+                      RuleType.DISABILITY: "is_disabled", RuleType.MINORITY: "is_minority"}
+        gender_rule = occ_rule = caste_rule = 0
+        gender_allow: dict[int, int] = {}
+        occ_allow: dict[int, int] = {}
+        caste_allow: dict[int, int] = {}
+        age_checks: list[tuple[int, int, int]] = []
+        income_checks: list[tuple[int, float]] = []
+
+        for i, scheme in enumerate(SCHEMES):
+            bit = 1 << i
+            age_min, age_max = -1, 1 << 30
+            for rule in scheme.eligibility_rules:
+                rtype = rule.rule_type
+                if rtype in flag_types:
+                    flag_masks[flag_types[rtype]] |= bit
+                elif rtype in count_slots:
+                    count_masks[count_slots[rtype]] |= bit
+                elif rtype == RuleType.GENDER:
+                    gender_rule |= bit
+                    code = _GENDER_CODE.get(rule.value, -1)
+                    gender_allow[code] = gender_allow.get(code, 0) | bit
+                elif rtype == RuleType.OCCUPATION:
+                    occ_rule |= bit
+                    for v in rule.value.split(","):
+                        code = _OCC_CODE.get(v.strip())
+                        if code is not None:
+                            occ_allow[code] = occ_allow.get(code, 0) | bit
+                elif rtype == RuleType.CASTE:
+                    caste_rule |= bit
+                    for v in rule.value.split(","):
+                        code = _CASTE_CODE.get(v.strip())
+                        if code is not None:
+                            caste_allow[code] = caste_allow.get(code, 0) | bit
+                elif rtype == RuleType.AGE_MIN:
+                    age_min = int(rule.value)
+                elif rtype == RuleType.AGE_MAX:
+                    age_max = int(rule.value)
+                elif rtype == RuleType.INCOME_MAX:
+                    income_checks.append((bit, float(rule.value)))
+            if age_min != -1 or age_max != 1 << 30:
+                age_checks.append((bit, age_min, age_max))
+
+        self._pf_bool = tuple(
+            (CitizenVec._fields.index(slot), mask)
+            for slot, mask in {**flag_masks, **count_masks}.items()
+            if mask
+        )
+        self._pf_gender = (gender_rule, gender_allow)
+        self._pf_occupation = (occ_rule, occ_allow)
+        self._pf_caste = (caste_rule, caste_allow)
+        self._pf_age = tuple(age_checks)
+        self._pf_income = tuple(income_checks)
+        self._pf_all = (1 << len(SCHEMES)) - 1
+
+    def _candidate_mask(self, vec: CitizenVec) -> int:
+        """Bitmask of schemes the alpha index cannot rule out for vec."""
+        fail = 0
+        for slot, mask in self._pf_bool:
+            if not vec[slot]:
+                fail |= mask
+        rule_mask, allow = self._pf_gender
+        fail |= rule_mask & ~allow.get(vec.gender, 0)
+        rule_mask, allow = self._pf_occupation
+        fail |= rule_mask & ~allow.get(vec.occupation, 0)
+        rule_mask, allow = self._pf_caste
+        fail |= rule_mask & ~allow.get(vec.caste, 0)
+        age = vec.age
+        for bit, lo, hi in self._pf_age:
+            if not lo <= age <= hi:
+                fail |= bit
+        income = vec.income
+        for bit, limit in self._pf_income:
+            if income > limit:
+                fail |= bit
+        return self._pf_all & ~fail
+
+    def _build_dependency_csr(self) -> None:
+        """Pack reverse DEPENDS_ON edges into indptr/neighbors arrays.
+        _dep_neighbors[_dep_indptr[i]:_dep_indptr[i+1]] are the dense
+        indices of schemes that depend on scheme i."""
+        self._id_to_idx = {s.scheme_id: i for i, s in enumerate(SCHEMES)}
+        self._idx_to_id = [s.scheme_id for s in SCHEMES]
+
+        buckets: list[list[int]] = [[] for _ in SCHEMES]
+        for i, scheme in enumerate(SCHEMES):
+            for dep_id in scheme.depends_on:
+                j = self._id_to_idx.get(dep_id)
+                if j is not None:
+                    buckets[j].append(i)
+
+        indptr = [0]
+        neighbors: list[int] = []
+        for bucket in buckets:
+            neighbors.extend(bucket)
+            indptr.append(len(neighbors))
+        self._dep_indptr = indptr
+        self._dep_neighbors = neighbors
+
+        self._unlocks_cache = {
+            sid: tuple(self._chain_bfs(i, MAX_HOPS)) for sid, i in self._id_to_idx.items()
+        }
+
+        # Conflicts are symmetric however the data declares them: OR the
+        # reverse bit into both masks so a one-sided conflicts_with entry
+        # is still caught whichever side of the pair pops first
+        id_to_idx = self._id_to_idx
+        idx_to_id = self._idx_to_id
+        mask_by_idx = [0] * len(SCHEMES)
+        for i, scheme in enumerate(SCHEMES):
+            for cid in scheme.conflicts_with:
+                j = id_to_idx.get(cid)
+                if j is not None:
+                    mask_by_idx[i] |= 1 << j
+                    mask_by_idx[j] |= 1 << i
+        for i, mask in enumerate(mask_by_idx):
+            self._conflict_masks[idx_to_id[i]] = mask
 
     # ── Eligibility Evaluation ───────────────────────────────────────────
 
     def evaluate_rule(self, rule: EligibilityRule, citizen: CitizenProfile) -> bool:
         """Evaluate a single eligibility rule against a citizen profile."""
-        rt = rule.rule_type
-        val = rule.value
-
-        if rt == RuleType.AGE_MIN:
-            return (citizen.age or 0) >= int(val)
-        if rt == RuleType.AGE_MAX:
-            return (citizen.age or 0) <= int(val)
-        if rt == RuleType.INCOME_MAX:
-            return citizen.annual_income <= float(val)
-        if rt == RuleType.GENDER:
-            return citizen.gender.value == val
-        if rt == RuleType.CASTE:
-            allowed = [c.strip() for c in val.split(",")]
-            return citizen.caste_category.value in allowed
-        if rt == RuleType.STATE:
-            return citizen.address.state.lower() == val.lower()
-        if rt == RuleType.OCCUPATION:
-            allowed = [o.strip() for o in val.split(",")]
-            return citizen.occupation.value in allowed
-        if rt == RuleType.EDUCATION_MIN:
-            return _EDU_ORDER.get(citizen.education.value, 0) >= _EDU_ORDER.get(val, 0)
-        if rt == RuleType.EDUCATION_MAX:
-            return _EDU_ORDER.get(citizen.education.value, 0) <= _EDU_ORDER.get(val, 0)
-        if rt == RuleType.BPL:
-            return citizen.is_bpl
-        if rt == RuleType.DISABILITY:
-            return citizen.is_disabled
-        if rt == RuleType.PREGNANT:
-            return citizen.is_pregnant
-        if rt == RuleType.HAS_CHILDREN:
-            return citizen.num_children > 0
-        if rt == RuleType.HAS_DAUGHTERS:
-            return citizen.num_daughters > 0
-        if rt == RuleType.MINORITY:
-            return citizen.is_minority
-
-        # Custom rules
-        if rt == RuleType.CUSTOM:
-            if rule.condition == "child_age_max":
-                return any(
-                    m.relationship == "child" and m.age <= int(val)
-                    for m in citizen.family_members
-                )
-            if rule.condition == "sc_st_or_female":
-                return (
-                    citizen.caste_category.value in ("sc", "st")
-                    or citizen.gender.value == "female"
-                )
-
-        return False
+        return _compiled_predicate(rule)(_pack_citizen(citizen))
 
     # ── Scheme Discovery ─────────────────────────────────────────────────
 
-    def discover_schemes(self, citizen: CitizenProfile) -> list[SchemeMatch]:
+    def evaluate_scheme(
+        self,
+        citizen: CitizenProfile | None,
+        scheme: Scheme,
+        citizen_docs: frozenset[str] | None = None,
+        citizen_vec: CitizenVec | None = None,
+    ) -> SchemeMatch:
         """
-        Find all schemes a citizen is potentially eligible for.
-        Returns ranked list sorted by benefit × approval probability.
+        Match a single scheme against a citizen profile.
+        Same logic as discover_schemes but O(1) in the number of schemes;
+        the returned match carries no rank (ranking needs the full list).
+        Callers evaluating many schemes pass citizen_docs / citizen_vec to
+        avoid rebuilding the document set and packed features per scheme
+        (citizen may then be None — the profile itself is never read).
         """
-        matches: list[SchemeMatch] = []
-
-        for scheme in SCHEMES:
-            matched: list[str] = []
-            failed: list[str] = []
-
-            for rule in scheme.eligibility_rules:
-                if self.evaluate_rule(rule, citizen):
-                    matched.append(rule.description or rule.rule_id)
-                else:
-                    failed.append(rule.description or rule.rule_id)
-
-            total = len(scheme.eligibility_rules)
-            score = len(matched) / total if total else 1.0
-            is_eligible = len(failed) == 0
-
-            # Find missing documents
-            citizen_doc_types = set(citizen.documents)
-            missing = [d for d in scheme.required_documents if d not in citizen_doc_types]
-
-            # Detect conflicts
-            conflicts = [
-                SCHEME_MAP[cid].name
-                for cid in scheme.conflicts_with
-                if cid in SCHEME_MAP
+        if citizen_vec is None:
+            citizen_vec = _pack_citizen(citizen)
+        matched: list[str] = []
+        failed: list[str] = []
+
+        compiled = self._compiled_rules.get(scheme.scheme_id)
+        if compiled is None:
+            # Scheme outside the built graph — compile its rules on the fly
+            compiled = [
+                (rule.description or rule.rule_id, _compiled_predicate(rule))
+                for rule in scheme.eligibility_rules
             ]
+        for label, pred in compiled:
+            (matched if pred(citizen_vec) else failed).append(label)
+
+        total = len(scheme.eligibility_rules)
+        score = len(matched) / total if total else 1.0
+        is_eligible = len(failed) == 0
+
+        # Find missing documents
+        if citizen_docs is None:
+            citizen_docs = frozenset(citizen.documents)
+        if scheme.required_documents_set <= citizen_docs:
+            missing: list[str] = []
+        else:
+            missing = [d for d in scheme.required_documents if d not in citizen_docs]
+
+        # Detect conflicts (walrus avoids the membership + index double lookup)
+        sm = SCHEME_MAP
+        conflicts = [s.name for cid in scheme.conflicts_with if (s := sm.get(cid))]
+
+        # Benefit chains
+        unlocks = self.find_benefit_chain(scheme.scheme_id)
+
+        approval_prob = score * scheme.approval_rate
+
+        return SchemeMatch(
+            scheme=scheme,
+            eligibility_score=round(score, 2),
+            matched_rules=matched,
+            failed_rules=failed,
+            missing_documents=missing,
+            estimated_benefit=scheme.benefit_amount,
+            approval_probability=round(approval_prob, 2),
+            is_eligible=is_eligible,
+            conflicts=conflicts,
+            unlocks=[s.name for uid in unlocks if (s := sm.get(uid))],
+        )
 
-            # Benefit chains
-            unlocks = self.find_benefit_chain(scheme.scheme_id)
+    def _evaluate_all(
+        self, citizen_vec: CitizenVec, citizen_docs: frozenset[str]
+    ) -> tuple[SchemeMatch, ...]:
+        """Evaluate and sort every scheme for one packed citizen.
+        Keyed entirely by (vec, docs) — the only citizen state the rules
+        read — so results are cacheable across requests; ranks are left
+        unset and stamped onto per-request copies by discover_schemes."""
+        # Decorate-sort-undecorate: keys are computed once in the
+        # comprehension and compared via C-level itemgetter — no per-element
+        # lambda frames. itemgetter(0) keeps the sort stable on ties.
+        pairs = [
+            (
+                (m.is_eligible, m.estimated_benefit * m.approval_probability),
+                m,
+            )
+            for scheme in SCHEMES
+            if (m := self.evaluate_scheme(None, scheme, citizen_docs, citizen_vec))
+        ]
 
-            approval_prob = score * scheme.approval_rate
+        # Sort by (eligible first, then benefit × approval descending)
+        pairs.sort(key=operator.itemgetter(0), reverse=True)
+        return tuple(m for _, m in pairs)
 
-            matches.append(SchemeMatch(
-                scheme=scheme,
-                eligibility_score=round(score, 2),
-                matched_rules=matched,
-                failed_rules=failed,
-                missing_documents=missing,
-                estimated_benefit=scheme.benefit_amount,
-                approval_probability=round(approval_prob, 2),
-                is_eligible=is_eligible,
-                conflicts=conflicts,
-                unlocks=[SCHEME_MAP[uid].name for uid in unlocks if uid in SCHEME_MAP],
-            ))
+    def discover_schemes(
+        self, citizen: CitizenProfile, *, top_k: int | None = None
+    ) -> list[SchemeMatch]:
+        """
+        Find all schemes a citizen is potentially eligible for.
+        Returns ranked list sorted by benefit × approval probability.
+        Repeat calls for an unchanged citizen are served from cache.
 
-        # Sort by (eligible first, then benefit × approval descending)
-        matches.sort(
-            key=lambda m: (m.is_eligible, m.estimated_benefit * m.approval_probability),
-            reverse=True,
+        With top_k set, only the K best fully-eligible matches are
+        returned: ineligible schemes are dropped at their first failed
+        rule without building match metadata, which skips most of the
+        work for citizens who qualify for a handful of schemes.
+        """
+        if top_k is not None:
+            return self._discover_top_k(citizen, top_k)
+        cached = self._discover_cached(
+            _pack_citizen(citizen), frozenset(citizen.documents)
         )
+        # Shallow copies so per-request rank never mutates cached entries
+        return [m.model_copy(update={"rank": i + 1}) for i, m in enumerate(cached)]
+
+    def _discover_top_k(self, citizen: CitizenProfile, top_k: int) -> list[SchemeMatch]:
+        """Early-exit discovery: bail on the first failed rule per scheme
+        and materialize SchemeMatch (docs, conflicts, unlocks) only for the
+        schemes that pass everything."""
+        citizen_vec = _pack_citizen(citizen)
+        citizen_docs = frozenset(citizen.documents)
+
+        candidates = self._candidate_mask(citizen_vec)
+        pred_rows = self._pred_rows
+        pairs: list[tuple[tuple[bool, float], SchemeMatch]] = []
+        for i, scheme in enumerate(SCHEMES):
+            if not candidates >> i & 1:
+                continue
+            for pred in pred_rows[i]:
+                if not pred(citizen_vec):
+                    break
+            else:
+                m = self.evaluate_scheme(None, scheme, citizen_docs, citizen_vec)
+                pairs.append(
+                    ((m.is_eligible, m.estimated_benefit * m.approval_probability), m)
+                )
 
-        # Assign ranks
+        pairs.sort(key=operator.itemgetter(0), reverse=True)
+        matches = [m for _, m in pairs[:top_k]]
         for i, m in enumerate(matches):
             m.rank = i + 1
-
         return matches
 
+    def discover_schemes_batch(
+        self, citizens: list[CitizenProfile], max_workers: int = 4
+    ) -> list[list[SchemeMatch]]:
+        """
+        Run discover_schemes for many citizens at once.
+        The graph's tables are built once and never mutated after __init__,
+        so evaluations are safe to fan out across a thread pool; small
+        batches skip the pool entirely since its setup costs more than the
+        work. Results keep the input order.
+        """
+        if len(citizens) <= 1:
+            return [self.discover_schemes(c) for c in citizens]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(citizens))) as pool:
+            return list(pool.map(self.discover_schemes, citizens))
+
+    def eligibility_matrix(self, batch: CitizenBatch) -> list[list[bool]]:
+        """
+        Rule-only eligibility for a CitizenBatch against every scheme.
+        Returns a citizens × schemes grid of booleans aligned with
+        SCHEME_IDS order. Iteration is scheme-major so each scheme's
+        compiled predicate list is resolved once and streamed over the
+        packed vectors, exiting a citizen at its first failed rule.
+        Document checks are out of scope here — this answers "do the
+        rules pass", the bulk analogue of the top_k fast scan.
+        """
+        vecs = batch.vecs
+        candidates = [self._candidate_mask(vec) for vec in vecs]
+        grid = [[True] * len(SCHEMES) for _ in vecs]
+        for col, preds in enumerate(self._pred_rows):
+            for row, vec in enumerate(vecs):
+                if not candidates[row] >> col & 1:
+                    grid[row][col] = False
+                    continue
+                for pred in preds:
+                    if not pred(vec):
+                        grid[row][col] = False
+                        break
+        return grid
+
     # ── Benefit Chain Discovery (multi-hop) ──────────────────────────────
 
     def find_benefit_chain(self, scheme_id: str, max_hops: int = MAX_HOPS) -> list[str]:
         """
         Follow DEPENDS_ON edges backwards to find schemes that require this
         scheme as a prerequisite (Req 2.5 — up to 5 hops).
+        Default-depth chains come from the table precomputed at build time.
         """
-        dependents: list[str] = []
-        visited: set[str] = {scheme_id}
-
-        frontier = [scheme_id]
+        if max_hops == MAX_HOPS:
+            cached = self._unlocks_cache.get(scheme_id)
+            return list(cached) if cached is not None else []
+
+        start = self._id_to_idx.get(scheme_id)
+        if start is None:
+            return []
+        return self._chain_bfs(start, max_hops)
+
+    def _chain_bfs(self, start: int, max_hops: int) -> list[str]:
+        """BFS over the reverse-dependency CSR from a dense scheme index."""
+        indptr = self._dep_indptr
+        neighbors = self._dep_neighbors
+        visited = bytearray(len(self._idx_to_id))
+        visited[start] = 1
+
+        dependents: list[int] = []
+        frontier = [start]
         for _ in range(max_hops):
-            next_frontier: list[str] = []
-            for current in frontier:
-                for predecessor in self.graph.predecessors(current):
-                    edge_data = self.graph.get_edge_data(predecessor, current)
-                    if (
-                        edge_data
-                        and edge_data.get("relation") == "DEPENDS_ON"
-                        and predecessor not in visited
-                    ):
-                        visited.add(predecessor)
-                        dependents.append(predecessor)
-                        next_frontier.append(predecessor)
+            next_frontier: list[int] = []
+            for u in frontier:
+                for v in neighbors[indptr[u]:indptr[u + 1]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        dependents.append(v)
+                        next_frontier.append(v)
             frontier = next_frontier
             if not frontier:
                 break
 
-        return dependents
+        idx_to_id = self._idx_to_id
+        return [idx_to_id[i] for i in dependents]
+
+    # ── Transitive dependency views (precomputed) ────────────────────────
+
+    @staticmethod
+    def transitive_deps(scheme_id: str) -> frozenset[str]:
+        """Every prerequisite of a scheme, direct and transitive — an O(1)
+        read of the closure fixpointed at import in schemes_data."""
+        return SCHEME_DEPS_CLOSURE.get(scheme_id, _EMPTY_IDS)
+
+    @staticmethod
+    def transitive_dependents(scheme_id: str) -> frozenset[str]:
+        """Reverse view: every scheme that (transitively) requires this one."""
+        return SCHEME_DEPENDENTS_CLOSURE.get(scheme_id, _EMPTY_IDS)
 
     # ── Conflict Detection ───────────────────────────────────────────────
 
@@ -235,31 +698,99 @@ class SchemeGraph:
         Given a list of scheme IDs the citizen intends to apply for,
         return pairs that conflict (Req 2.4, Property 7).
         """
-        conflicts: list[tuple[str, str]] = []
-        checked: set[tuple[str, str]] = set()
+        id_to_idx = self._id_to_idx
+        idx_to_id = self._idx_to_id
+        masks = self._conflict_masks
 
+        selected_mask = 0
         for sid in scheme_ids:
-            for neighbor in self.graph.successors(sid):
-                edge = self.graph.get_edge_data(sid, neighbor)
-                if edge and edge.get("relation") == "CONFLICTS_WITH":
-                    if neighbor in scheme_ids:
-                        pair = tuple(sorted((sid, neighbor)))
-                        if pair not in checked:
-                            checked.add(pair)
-                            conflicts.append(pair)
+            idx = id_to_idx.get(sid)
+            if idx is not None:
+                selected_mask |= 1 << idx
+
+        # Conflicts are symmetric, so only pair each scheme with peers at
+        # higher indices: after popping the lowest bit, what remains of the
+        # selection is exactly those peers. Each pair surfaces once — no
+        # dedup set — and duplicate input IDs collapse into the bitmask.
+        conflicts: list[tuple[str, str]] = []
+        remaining = selected_mask
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            sid = idx_to_id[low.bit_length() - 1]
+            hits = masks.get(sid, 0) & remaining
+            while hits:
+                peer = hits & -hits
+                hits ^= peer
+                pair = (sid, idx_to_id[peer.bit_length() - 1])
+                conflicts.append(pair if pair[0] < pair[1] else (pair[1], pair[0]))
 
         return conflicts
 
     # ── Graph Statistics ─────────────────────────────────────────────────
 
     def stats(self) -> dict:
-        schemes = [n for n, d in self.graph.nodes(data=True) if d.get("node_type") == "scheme"]
-        rules = [n for n, d in self.graph.nodes(data=True) if d.get("node_type") == "rule"]
-        docs = [n for n, d in self.graph.nodes(data=True) if d.get("node_type") == "document"]
         return {
-            "total_nodes": self.graph.number_of_nodes(),
-            "total_edges": self.graph.number_of_edges(),
-            "schemes": len(schemes),
-            "rules": len(rules),
-            "documents": len(docs),
+            "total_nodes": len(SCHEMES) + self._rule_count + self._doc_count,
+            "total_edges": self._edge_count,
+            "schemes": len(SCHEMES),
+            "rules": self._rule_count,
+            "documents": self._doc_count,
         }
+
+    # ── NetworkX Export (diagnostics only) ───────────────────────────────
+
+    @property
+    def graph(self) -> "nx.DiGraph":
+        """Lazily built NetworkX view of the graph for debugging/export."""
+        if self._nx_graph is None:
+            self._nx_graph = self.to_networkx()
+        return self._nx_graph
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Materialize the scheme–rule–document graph as a NetworkX DiGraph."""
+        # Deferred: networkx costs >100 ms to import and only this
+        # diagnostic view needs it
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for scheme in SCHEMES:
+            # Scheme node
+            graph.add_node(
+                scheme.scheme_id,
+                node_type="scheme",
+                name=scheme.name,
+                category=scheme.category.value,
+                benefit=scheme.benefit_amount,
+            )
+
+            # Rule nodes + edges
+            for rule in scheme.eligibility_rules:
+                rule_node = f"rule_{rule.rule_id}"
+                graph.add_node(
+                    rule_node,
+                    node_type="rule",
+                    rule_type=rule.rule_type.value,
+                    condition=rule.condition,
+                    value=rule.value,
+                )
+                graph.add_edge(scheme.scheme_id, rule_node, relation="REQUIRES")
+
+            # Document nodes + edges
+            for doc in scheme.required_documents:
+                doc_node = f"doc_{doc}"
+                if not graph.has_node(doc_node):
+                    graph.add_node(doc_node, node_type="document", doc_type=doc)
+                graph.add_edge(scheme.scheme_id, doc_node, relation="NEEDS_DOCUMENT")
+
+            # Dependency edges
+            for dep_id in scheme.depends_on:
+                if dep_id in SCHEME_MAP:
+                    graph.add_edge(scheme.scheme_id, dep_id, relation="DEPENDS_ON")
+
+            # Conflict edges
+            for conflict_id in scheme.conflicts_with:
+                if conflict_id in SCHEME_MAP:
+                    graph.add_edge(scheme.scheme_id, conflict_id, relation="CONFLICTS_WITH")
+                    graph.add_edge(conflict_id, scheme.scheme_id, relation="CONFLICTS_WITH")
+        return graph
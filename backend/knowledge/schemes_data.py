@@ -4,13 +4,34 @@ required documents, benefit amounts, and inter-scheme relationships.
 Covers Req 8: Knowledge Graph Management.
 """
 
+import sys
+
 from backend.models.scheme import (
     Scheme, EligibilityRule, RuleType, SchemeCategory,
 )
 
+
+# The knowledge base is static, trusted, in-repo data — running the full
+# Pydantic validation pipeline over every scheme and rule at import buys
+# nothing. model_construct skips validators/coercion; the one coercion the
+# data relies on (int benefit amounts) is applied by hand.
+_rule = EligibilityRule.model_construct
+
+
+def _scheme(**fields) -> Scheme:
+    fields["benefit_amount"] = float(fields.get("benefit_amount", 0.0))
+    # Document names recur across most schemes ("aadhaar" alone appears in
+    # nearly all) — intern them so duplicates share one object and later
+    # equality checks can short-circuit on identity
+    fields["required_documents"] = [
+        sys.intern(d) for d in fields.get("required_documents", [])
+    ]
+    return Scheme.model_construct(**fields)
+
+
 SCHEMES: list[Scheme] = [
     # ── 1. PM-KISAN ──────────────────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pm_kisan",
         name="PM-KISAN Samman Nidhi",
         ministry="Ministry of Agriculture & Farmers Welfare",
@@ -19,8 +40,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=6000,
         benefit_description="₹6,000 per year in 3 installments of ₹2,000",
         eligibility_rules=[
-            EligibilityRule(rule_id="pmk_1", rule_type=RuleType.OCCUPATION, condition="==", value="farmer", description="Must be a farmer"),
-            EligibilityRule(rule_id="pmk_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="500000", description="Annual income ≤ ₹5 lakh"),
+            _rule(rule_id="pmk_1", rule_type=RuleType.OCCUPATION, condition="==", value="farmer", description="Must be a farmer"),
+            _rule(rule_id="pmk_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="500000", description="Annual income ≤ ₹5 lakh"),
         ],
         required_documents=["aadhaar", "bank_statement", "income_certificate"],
         portal_url="https://pmkisan.gov.in",
@@ -31,7 +52,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 2. PM Ujjwala Yojana ─────────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pm_ujjwala",
         name="Pradhan Mantri Ujjwala Yojana",
         ministry="Ministry of Petroleum & Natural Gas",
@@ -40,9 +61,9 @@ SCHEMES: list[Scheme] = [
         benefit_amount=1600,
         benefit_description="Free LPG connection + first refill and stove",
         eligibility_rules=[
-            EligibilityRule(rule_id="uj_1", rule_type=RuleType.GENDER, condition="==", value="female", description="Applicant must be female"),
-            EligibilityRule(rule_id="uj_2", rule_type=RuleType.BPL, condition="==", value="true", description="Must belong to BPL household"),
-            EligibilityRule(rule_id="uj_3", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
+            _rule(rule_id="uj_1", rule_type=RuleType.GENDER, condition="==", value="female", description="Applicant must be female"),
+            _rule(rule_id="uj_2", rule_type=RuleType.BPL, condition="==", value="true", description="Must belong to BPL household"),
+            _rule(rule_id="uj_3", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
         ],
         required_documents=["aadhaar", "bpl_card", "bank_statement"],
         portal_url="https://www.pmujjwalayojana.com",
@@ -52,7 +73,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 3. Pradhan Mantri Awas Yojana (PMAY) ────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pmay",
         name="Pradhan Mantri Awas Yojana (Gramin)",
         ministry="Ministry of Housing & Urban Affairs",
@@ -61,8 +82,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=120000,
         benefit_description="₹1,20,000 in plains / ₹1,30,000 in hilly areas",
         eligibility_rules=[
-            EligibilityRule(rule_id="pmay_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
-            EligibilityRule(rule_id="pmay_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="300000", description="Annual income ≤ ₹3 lakh"),
+            _rule(rule_id="pmay_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
+            _rule(rule_id="pmay_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="300000", description="Annual income ≤ ₹3 lakh"),
         ],
         required_documents=["aadhaar", "income_certificate", "bpl_card", "bank_statement"],
         portal_url="https://pmaymis.gov.in",
@@ -73,7 +94,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 4. PM Jan Dhan Yojana ────────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pm_jan_dhan",
         name="Pradhan Mantri Jan Dhan Yojana",
         ministry="Ministry of Finance",
@@ -82,7 +103,7 @@ SCHEMES: list[Scheme] = [
         benefit_amount=10000,
         benefit_description="Overdraft up to ₹10,000 + ₹2 lakh accident insurance",
         eligibility_rules=[
-            EligibilityRule(rule_id="jdy_1", rule_type=RuleType.AGE_MIN, condition=">=", value="10", description="Age ≥ 10"),
+            _rule(rule_id="jdy_1", rule_type=RuleType.AGE_MIN, condition=">=", value="10", description="Age ≥ 10"),
         ],
         required_documents=["aadhaar"],
         portal_url="https://pmjdy.gov.in",
@@ -92,7 +113,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 5. Sukanya Samriddhi Yojana ──────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="sukanya_samriddhi",
         name="Sukanya Samriddhi Yojana",
         ministry="Ministry of Finance",
@@ -101,8 +122,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=250000,
         benefit_description="Tax-free returns at 8.2% p.a. (maturity at 21 years)",
         eligibility_rules=[
-            EligibilityRule(rule_id="ssy_1", rule_type=RuleType.HAS_DAUGHTERS, condition="==", value="true", description="Must have at least one daughter"),
-            EligibilityRule(rule_id="ssy_2", rule_type=RuleType.CUSTOM, condition="child_age_max", value="10", description="Daughter's age ≤ 10"),
+            _rule(rule_id="ssy_1", rule_type=RuleType.HAS_DAUGHTERS, condition="==", value="true", description="Must have at least one daughter"),
+            _rule(rule_id="ssy_2", rule_type=RuleType.CUSTOM, condition="child_age_max", value="10", description="Daughter's age ≤ 10"),
         ],
         required_documents=["aadhaar", "birth_certificate", "bank_statement"],
         portal_url="https://www.india.gov.in/sukanya-samriddhi-yojana",
@@ -113,7 +134,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 6. Beti Bachao Beti Padhao ──────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="beti_bachao",
         name="Beti Bachao Beti Padhao",
         ministry="Ministry of Women & Child Development",
@@ -122,7 +143,7 @@ SCHEMES: list[Scheme] = [
         benefit_amount=50000,
         benefit_description="Education and welfare grants for girl children",
         eligibility_rules=[
-            EligibilityRule(rule_id="bb_1", rule_type=RuleType.HAS_DAUGHTERS, condition="==", value="true", description="Must have at least one daughter"),
+            _rule(rule_id="bb_1", rule_type=RuleType.HAS_DAUGHTERS, condition="==", value="true", description="Must have at least one daughter"),
         ],
         required_documents=["aadhaar", "birth_certificate", "income_certificate"],
         portal_url="https://wcd.nic.in/bbbp-schemes",
@@ -133,7 +154,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 7. PM Matru Vandana Yojana ───────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pm_matru_vandana",
         name="Pradhan Mantri Matru Vandana Yojana",
         ministry="Ministry of Women & Child Development",
@@ -142,9 +163,9 @@ SCHEMES: list[Scheme] = [
         benefit_amount=5000,
         benefit_description="₹5,000 in three installments during pregnancy",
         eligibility_rules=[
-            EligibilityRule(rule_id="mv_1", rule_type=RuleType.GENDER, condition="==", value="female", description="Must be female"),
-            EligibilityRule(rule_id="mv_2", rule_type=RuleType.PREGNANT, condition="==", value="true", description="Must be pregnant or lactating"),
-            EligibilityRule(rule_id="mv_3", rule_type=RuleType.AGE_MIN, condition=">=", value="19", description="Age ≥ 19"),
+            _rule(rule_id="mv_1", rule_type=RuleType.GENDER, condition="==", value="female", description="Must be female"),
+            _rule(rule_id="mv_2", rule_type=RuleType.PREGNANT, condition="==", value="true", description="Must be pregnant or lactating"),
+            _rule(rule_id="mv_3", rule_type=RuleType.AGE_MIN, condition=">=", value="19", description="Age ≥ 19"),
         ],
         required_documents=["aadhaar", "bank_statement", "income_certificate"],
         portal_url="https://wcd.nic.in/schemes/pradhan-mantri-matru-vandana-yojana",
@@ -154,7 +175,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 8. National Social Assistance Programme (Old Age Pension) ────────
-    Scheme(
+    _scheme(
         scheme_id="nsap_pension",
         name="Indira Gandhi National Old Age Pension",
         ministry="Ministry of Rural Development",
@@ -163,8 +184,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=6000,
         benefit_description="₹200-500/month pension for elderly BPL citizens",
         eligibility_rules=[
-            EligibilityRule(rule_id="nsap_1", rule_type=RuleType.AGE_MIN, condition=">=", value="60", description="Age ≥ 60"),
-            EligibilityRule(rule_id="nsap_2", rule_type=RuleType.BPL, condition="==", value="true", description="Must belong to BPL household"),
+            _rule(rule_id="nsap_1", rule_type=RuleType.AGE_MIN, condition=">=", value="60", description="Age ≥ 60"),
+            _rule(rule_id="nsap_2", rule_type=RuleType.BPL, condition="==", value="true", description="Must belong to BPL household"),
         ],
         required_documents=["aadhaar", "bpl_card", "bank_statement", "income_certificate"],
         portal_url="https://nsap.nic.in",
@@ -174,7 +195,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 9. Atal Pension Yojana ───────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="atal_pension",
         name="Atal Pension Yojana",
         ministry="Ministry of Finance",
@@ -183,9 +204,9 @@ SCHEMES: list[Scheme] = [
         benefit_amount=60000,
         benefit_description="₹1,000–₹5,000/month pension after 60 years of age",
         eligibility_rules=[
-            EligibilityRule(rule_id="apy_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
-            EligibilityRule(rule_id="apy_2", rule_type=RuleType.AGE_MAX, condition="<=", value="40", description="Age ≤ 40"),
-            EligibilityRule(rule_id="apy_3", rule_type=RuleType.INCOME_MAX, condition="<=", value="180000", description="Annual income ≤ ₹1.8 lakh (tax-exempt)"),
+            _rule(rule_id="apy_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
+            _rule(rule_id="apy_2", rule_type=RuleType.AGE_MAX, condition="<=", value="40", description="Age ≤ 40"),
+            _rule(rule_id="apy_3", rule_type=RuleType.INCOME_MAX, condition="<=", value="180000", description="Annual income ≤ ₹1.8 lakh (tax-exempt)"),
         ],
         required_documents=["aadhaar", "bank_statement"],
         portal_url="https://www.npscra.nsdl.co.in/scheme-details.php",
@@ -195,7 +216,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 10. National Scholarship Portal ──────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="national_scholarship",
         name="National Scholarship Portal — Post-Matric Scholarship",
         ministry="Ministry of Social Justice",
@@ -204,9 +225,9 @@ SCHEMES: list[Scheme] = [
         benefit_amount=36000,
         benefit_description="Tuition fee + maintenance allowance up to ₹36,000/year",
         eligibility_rules=[
-            EligibilityRule(rule_id="nsp_1", rule_type=RuleType.CASTE, condition="in", value="sc,st,obc", description="Must be SC/ST/OBC"),
-            EligibilityRule(rule_id="nsp_2", rule_type=RuleType.EDUCATION_MIN, condition=">=", value="higher_secondary", description="Completed higher secondary"),
-            EligibilityRule(rule_id="nsp_3", rule_type=RuleType.INCOME_MAX, condition="<=", value="250000", description="Family income ≤ ₹2.5 lakh"),
+            _rule(rule_id="nsp_1", rule_type=RuleType.CASTE, condition="in", value="sc,st,obc", description="Must be SC/ST/OBC"),
+            _rule(rule_id="nsp_2", rule_type=RuleType.EDUCATION_MIN, condition=">=", value="higher_secondary", description="Completed higher secondary"),
+            _rule(rule_id="nsp_3", rule_type=RuleType.INCOME_MAX, condition="<=", value="250000", description="Family income ≤ ₹2.5 lakh"),
         ],
         required_documents=["aadhaar", "caste_certificate", "income_certificate", "educational_certificate", "bank_statement"],
         portal_url="https://scholarships.gov.in",
@@ -216,7 +237,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 11. Ayushman Bharat (PM-JAY) ─────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="ayushman_bharat",
         name="Ayushman Bharat — PM Jan Arogya Yojana",
         ministry="Ministry of Health & Family Welfare",
@@ -225,8 +246,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=500000,
         benefit_description="₹5 lakh per family per year health cover",
         eligibility_rules=[
-            EligibilityRule(rule_id="ab_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL or deprived household"),
-            EligibilityRule(rule_id="ab_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="300000", description="Annual income ≤ ₹3 lakh"),
+            _rule(rule_id="ab_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL or deprived household"),
+            _rule(rule_id="ab_2", rule_type=RuleType.INCOME_MAX, condition="<=", value="300000", description="Annual income ≤ ₹3 lakh"),
         ],
         required_documents=["aadhaar", "ration_card", "income_certificate"],
         portal_url="https://pmjay.gov.in",
@@ -236,7 +257,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 12. Mudra Loan (PMMY) ────────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="mudra_loan",
         name="Pradhan Mantri Mudra Yojana",
         ministry="Ministry of Finance",
@@ -245,8 +266,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=1000000,
         benefit_description="Loans: Shishu (≤₹50K), Kishore (≤₹5L), Tarun (≤₹10L)",
         eligibility_rules=[
-            EligibilityRule(rule_id="mud_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
-            EligibilityRule(rule_id="mud_2", rule_type=RuleType.OCCUPATION, condition="in", value="self_employed,farmer", description="Self-employed or micro-enterprise"),
+            _rule(rule_id="mud_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
+            _rule(rule_id="mud_2", rule_type=RuleType.OCCUPATION, condition="in", value="self_employed,farmer", description="Self-employed or micro-enterprise"),
         ],
         required_documents=["aadhaar", "pan", "bank_statement", "income_certificate"],
         portal_url="https://www.mudra.org.in",
@@ -256,7 +277,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 13. PM Disability Pension ────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="disability_pension",
         name="Indira Gandhi National Disability Pension",
         ministry="Ministry of Social Justice & Empowerment",
@@ -265,10 +286,10 @@ SCHEMES: list[Scheme] = [
         benefit_amount=3600,
         benefit_description="₹300/month pension for disabled BPL citizens",
         eligibility_rules=[
-            EligibilityRule(rule_id="dp_1", rule_type=RuleType.DISABILITY, condition="==", value="true", description="Must have ≥80% disability"),
-            EligibilityRule(rule_id="dp_2", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
-            EligibilityRule(rule_id="dp_3", rule_type=RuleType.AGE_MAX, condition="<=", value="79", description="Age ≤ 79"),
-            EligibilityRule(rule_id="dp_4", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
+            _rule(rule_id="dp_1", rule_type=RuleType.DISABILITY, condition="==", value="true", description="Must have ≥80% disability"),
+            _rule(rule_id="dp_2", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
+            _rule(rule_id="dp_3", rule_type=RuleType.AGE_MAX, condition="<=", value="79", description="Age ≤ 79"),
+            _rule(rule_id="dp_4", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
         ],
         required_documents=["aadhaar", "disability_certificate", "bpl_card", "bank_statement"],
         portal_url="https://nsap.nic.in",
@@ -278,7 +299,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 14. National Food Security Act (Ration Card) ─────────────────────
-    Scheme(
+    _scheme(
         scheme_id="nfsa_ration",
         name="National Food Security Act — Subsidized Ration",
         ministry="Ministry of Consumer Affairs",
@@ -287,7 +308,7 @@ SCHEMES: list[Scheme] = [
         benefit_amount=7200,
         benefit_description="5 kg/person/month at ₹1–₹3/kg (35 kg for Antyodaya)",
         eligibility_rules=[
-            EligibilityRule(rule_id="nfsa_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
+            _rule(rule_id="nfsa_1", rule_type=RuleType.BPL, condition="==", value="true", description="BPL household"),
         ],
         required_documents=["aadhaar", "ration_card", "income_certificate"],
         portal_url="https://nfsa.gov.in",
@@ -297,7 +318,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 15. Stand-Up India Scheme ────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="standup_india",
         name="Stand-Up India Scheme",
         ministry="Ministry of Finance",
@@ -306,8 +327,8 @@ SCHEMES: list[Scheme] = [
         benefit_amount=10000000,
         benefit_description="Loans ₹10 lakh to ₹1 crore for greenfield enterprise",
         eligibility_rules=[
-            EligibilityRule(rule_id="sui_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
-            EligibilityRule(rule_id="sui_2", rule_type=RuleType.CUSTOM, condition="sc_st_or_female", value="true", description="Must be SC/ST or female"),
+            _rule(rule_id="sui_1", rule_type=RuleType.AGE_MIN, condition=">=", value="18", description="Age ≥ 18"),
+            _rule(rule_id="sui_2", rule_type=RuleType.CUSTOM, condition="sc_st_or_female", value="true", description="Must be SC/ST or female"),
         ],
         required_documents=["aadhaar", "pan", "caste_certificate", "bank_statement", "income_certificate"],
         portal_url="https://www.standupmitra.in",
@@ -318,7 +339,7 @@ SCHEMES: list[Scheme] = [
     ),
 
     # ── 16. PM Fasal Bima Yojana ─────────────────────────────────────────
-    Scheme(
+    _scheme(
         scheme_id="pm_fasal_bima",
         name="Pradhan Mantri Fasal Bima Yojana",
         ministry="Ministry of Agriculture & Farmers Welfare",
@@ -327,7 +348,7 @@ SCHEMES: list[Scheme] = [
         benefit_amount=200000,
         benefit_description="Crop insurance cover up to ₹2 lakh with 2% premium",
         eligibility_rules=[
-            EligibilityRule(rule_id="pfb_1", rule_type=RuleType.OCCUPATION, condition="==", value="farmer", description="Must be a farmer"),
+            _rule(rule_id="pfb_1", rule_type=RuleType.OCCUPATION, condition="==", value="farmer", description="Must be a farmer"),
         ],
         required_documents=["aadhaar", "bank_statement", "income_certificate"],
         portal_url="https://pmfby.gov.in",
@@ -340,3 +361,99 @@ SCHEMES: list[Scheme] = [
 
 # Quick lookup by scheme_id
 SCHEME_MAP: dict[str, Scheme] = {s.scheme_id: s for s in SCHEMES}
+
+
+# ── Struct-of-arrays view ────────────────────────────────────────────────
+# Hot paths (submission, batch scoring) read a handful of scalar fields per
+# scheme; laying those out as parallel tuples turns five Pydantic attribute
+# loads into one index lookup plus plain tuple indexing, and gives the
+# batch scorer column-wise access.
+
+SCHEME_IDS: tuple[str, ...] = tuple(s.scheme_id for s in SCHEMES)
+SCHEME_INDEX: dict[str, int] = {sid: i for i, sid in enumerate(SCHEME_IDS)}
+
+SCHEME_COLS: dict[str, tuple] = {
+    "name": tuple(s.name for s in SCHEMES),
+    "execution_tier": tuple(s.execution_tier for s in SCHEMES),
+    "portal_url": tuple(s.portal_url for s in SCHEMES),
+    "benefit_amount": tuple(s.benefit_amount for s in SCHEMES),
+    "processing_days": tuple(s.processing_days for s in SCHEMES),
+    "approval_rate": tuple(s.approval_rate for s in SCHEMES),
+}
+
+# Document-requirement bitmasks: each document name gets a bit, each scheme
+# a mask, so "has all required documents" is one AND + compare.
+DOC_BIT: dict[str, int] = {
+    doc: 1 << i
+    for i, doc in enumerate(sorted({d for s in SCHEMES for d in s.required_documents}))
+}
+REQUIRED_DOCS_BITS: tuple[int, ...] = tuple(
+    sum(DOC_BIT[d] for d in s.required_documents) for s in SCHEMES
+)
+
+
+def rule_scalars(scheme: Scheme) -> tuple[float | None, tuple[int, ...]]:
+    """Pull the numeric rule limits out of a scheme's rule list once:
+    (income_max, age_limits). Risk scorers read these instead of
+    re-scanning eligibility_rules with string compares per call."""
+    income_max: float | None = None
+    for rule in scheme.eligibility_rules:
+        if rule.rule_type == RuleType.INCOME_MAX:
+            income_max = float(rule.value)
+            break
+    age_limits = tuple(
+        int(rule.value)
+        for rule in scheme.eligibility_rules
+        if rule.rule_type in (RuleType.AGE_MIN, RuleType.AGE_MAX)
+    )
+    return income_max, age_limits
+
+
+SCHEME_RULE_SCALARS: dict[str, tuple[float | None, tuple[int, ...]]] = {
+    s.scheme_id: rule_scalars(s) for s in SCHEMES
+}
+
+
+def _deps_closure() -> dict[str, frozenset[str]]:
+    """Transitive closure of depends_on, iterated to fixpoint. The graph
+    has under twenty nodes, so materializing the closure at import costs
+    nothing and turns multi-hop prerequisite questions into set lookups."""
+    closure = {
+        s.scheme_id: set(d for d in s.depends_on if d in SCHEME_MAP) for s in SCHEMES
+    }
+    changed = True
+    while changed:
+        changed = False
+        for deps in closure.values():
+            extra = {dd for d in deps for dd in closure[d]} - deps
+            if extra:
+                deps |= extra
+                changed = True
+    return {sid: frozenset(deps) for sid, deps in closure.items()}
+
+
+# All prerequisites of a scheme, direct and transitive
+SCHEME_DEPS_CLOSURE: dict[str, frozenset[str]] = _deps_closure()
+
+# Reverse view: every scheme that (transitively) requires this one
+SCHEME_DEPENDENTS_CLOSURE: dict[str, frozenset[str]] = {
+    sid: frozenset(
+        other for other, deps in SCHEME_DEPS_CLOSURE.items() if sid in deps
+    )
+    for sid in SCHEME_MAP
+}
+
+
+def scheme_requires(scheme_id: str, prerequisite_id: str) -> bool:
+    """True if scheme_id (transitively) depends on prerequisite_id."""
+    return prerequisite_id in SCHEME_DEPS_CLOSURE.get(scheme_id, ())
+
+
+def docs_to_bits(doc_names: list[str]) -> int:
+    """Encode document names as a bitmask over DOC_BIT; names outside the
+    vocabulary (e.g. free-form document IDs) contribute no bits."""
+    bit = DOC_BIT.get
+    mask = 0
+    for name in doc_names:
+        mask |= bit(name, 0)
+    return mask
@@ -7,10 +7,13 @@ to government welfare, scholarships, and subsidies.
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.knowledge.graph import SchemeGraph
+from backend.util import clock
+from backend.util.responses import OrjsonResponse
 from backend.routers import citizens, schemes, applications, agents
 
 
@@ -55,8 +58,18 @@ app = FastAPI(
     ),
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=OrjsonResponse,
 )
 
+@app.middleware("http")
+async def refresh_request_clock(request, call_next):
+    """One clock read per request — every timestamp stamped while handling
+    it (audit entries, pipeline events, model defaults) reuses the cached
+    ISO string via backend.util.clock."""
+    clock.refresh()
+    return await call_next(request)
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -73,22 +86,28 @@ app.include_router(applications.router)
 app.include_router(agents.router)
 
 
+# Static payloads serialized once at import — the handlers just hand the
+# bytes back
+_ROOT_JSON: bytes = orjson.dumps({
+    "name": "BharatBridge",
+    "tagline": "AI Execution Agent for Public Infrastructure",
+    "version": "1.0.0",
+    "endpoints": {
+        "docs": "/docs",
+        "citizens": "/api/citizens",
+        "schemes": "/api/schemes",
+        "applications": "/api/applications",
+        "pipeline": "/api/agents/pipeline",
+    },
+})
+_HEALTH_JSON: bytes = orjson.dumps({"status": "healthy"})
+
+
 @app.get("/")
 async def root():
-    return {
-        "name": "BharatBridge",
-        "tagline": "AI Execution Agent for Public Infrastructure",
-        "version": "1.0.0",
-        "endpoints": {
-            "docs": "/docs",
-            "citizens": "/api/citizens",
-            "schemes": "/api/schemes",
-            "applications": "/api/applications",
-            "pipeline": "/api/agents/pipeline",
-        },
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_JSON, media_type="application/json")
@@ -1,12 +1,31 @@
 """Application lifecycle and tracking data models."""
 
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from collections import deque
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer, field_validator
 from typing import Optional
-from datetime import datetime
+
+from backend.util import clock
+from backend.store.kv import ShardedStore
 from enum import Enum
 
 
+# Hot audit entries kept on the application itself; older entries spill to
+# the side table so update payloads stay bounded however long a case runs
+MAX_AUDIT_ENTRIES = 256
+
+# Append-only overflow log (DynamoDB AuditLog side table sim), keyed by
+# application_id
+_audit_overflow: ShardedStore = ShardedStore()
+
+
+def audit_overflow(application_id: str) -> list[AuditEntry]:
+    """Entries displaced from an application's bounded audit trail."""
+    return list(_audit_overflow.get(application_id) or ())
+
+
 class ApplicationStatus(str, Enum):
     DRAFT = "draft"
     VALIDATING = "validating"
@@ -20,10 +39,13 @@ class ApplicationStatus(str, Enum):
     APPEAL_REJECTED = "appeal_rejected"
 
 
-class AuditEntry(BaseModel):
-    """Audit log entry for submission attempts (Req 5.7)."""
+@dataclass(slots=True)
+class AuditEntry:
+    """Audit log entry for submission attempts (Req 5.7).
+    A slotted dataclass — entries are appended per pipeline step and never
+    validated from external input, so Pydantic construction cost is skipped."""
 
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = field(default_factory=clock.now_iso)
     action: str = ""
     agent: str = ""
     details: str = ""
@@ -76,23 +98,54 @@ class Application(BaseModel):
     benefit_amount: float = 0.0
     disbursement_details: str = ""
 
-    # Audit
-    audit_trail: list[AuditEntry] = Field(default_factory=list)
-
-    created_at: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
-    updated_at: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
+    # Audit — bounded; displaced entries land in the overflow side table
+    audit_trail: deque[AuditEntry] = Field(
+        default_factory=lambda: deque(maxlen=MAX_AUDIT_ENTRIES)
     )
+    audit_truncated: int = 0
+
+    created_at: str = Field(default_factory=clock.now_iso)
+    updated_at: str = Field(default_factory=clock.now_iso)
+
+    # Mutation counter + memoized dump for read endpoints; every mutation
+    # path in the agents goes through add_audit, which bumps the version
+    _version: int = PrivateAttr(default=0)
+    _dump_cache: Optional[tuple[int, dict]] = PrivateAttr(default=None)
+
+    @field_validator("audit_trail", mode="after")
+    @classmethod
+    def _cap_audit(cls, v: deque) -> deque:
+        # Validation builds an unbounded deque; re-wrap to enforce maxlen
+        return v if v.maxlen == MAX_AUDIT_ENTRIES else deque(v, maxlen=MAX_AUDIT_ENTRIES)
+
+    @field_serializer("audit_trail")
+    def _serialize_audit(self, v: deque) -> list[AuditEntry]:
+        return list(v)
 
     def add_audit(self, action: str, agent: str, details: str = "",
                   success: bool = True, error: str = "") -> None:
-        self.audit_trail.append(AuditEntry(
+        trail = self.audit_trail
+        if len(trail) == trail.maxlen:
+            overflow = _audit_overflow.get(self.application_id) or []
+            overflow.append(trail[0])
+            _audit_overflow[self.application_id] = overflow
+            self.audit_truncated += 1
+        trail.append(AuditEntry(
             action=action,
             agent=agent,
             details=details,
             success=success,
             error_message=error,
         ))
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = clock.now_iso()
+        self._version += 1
+
+    def dump_cached(self) -> dict:
+        """model_dump memoized against the mutation version — repeated
+        status polls and listings reuse one serialization."""
+        cached = self._dump_cache
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        data = self.model_dump()
+        self._dump_cache = (self._version, data)
+        return data
@@ -1,10 +1,13 @@
 """Citizen profile data models matching DynamoDB schema from design doc."""
 
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional
-from datetime import datetime
+from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
+
+from backend.util import clock
 
 
 class CasteCategory(str, Enum):
@@ -31,6 +34,13 @@ class EducationLevel(str, Enum):
     DOCTORATE = "doctorate"
 
 
+# Declaration order IS the education ladder — stamp the rank onto each
+# member so ordering comparisons are plain int compares, no dict lookup
+for _rank, _level in enumerate(EducationLevel):
+    _level.order = _rank
+del _rank, _level
+
+
 class Occupation(str, Enum):
     FARMER = "farmer"
     DAILY_WAGE = "daily_wage"
@@ -43,7 +53,21 @@ class Occupation(str, Enum):
     OTHER = "other"
 
 
-class Address(BaseModel):
+# Small-int codes for the categorical enums, mirroring EducationLevel.order:
+# rule predicates compare codes instead of hashing member strings. JSON
+# serialization still uses the string values.
+for _enum in (CasteCategory, Gender, Occupation):
+    for _code, _member in enumerate(_enum):
+        _member.code = _code
+del _enum, _code, _member
+
+
+# Address and FamilyMember are pure typed containers constructed far more
+# often than they are validated from untrusted input — plain slotted
+# dataclasses skip Pydantic's per-field machinery and __dict__ storage.
+# Pydantic still validates/serializes them when nested in models.
+@dataclass(slots=True)
+class Address:
     line1: str = ""
     line2: str = ""
     city: str = ""
@@ -52,7 +76,8 @@ class Address(BaseModel):
     pincode: str = ""
 
 
-class FamilyMember(BaseModel):
+@dataclass(slots=True)
+class FamilyMember:
     name: str
     relationship: str  # e.g. "spouse", "child", "parent"
     age: int
@@ -90,27 +115,36 @@ class CitizenProfile(BaseModel):
     documents: list[str] = Field(default_factory=list)  # Document IDs
     digilocker_connected: bool = False
     consent_retention: bool = False
-    created_at: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
-    updated_at: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
-
-    @property
+    created_at: str = Field(default_factory=clock.now_iso)
+    updated_at: str = Field(default_factory=clock.now_iso)
+
+    # Document names encoded against the shared DOC_BIT vocabulary;
+    # None until first derived (not serialized). Lets scorers check
+    # document completeness with a bitwise AND instead of set algebra.
+    _docs_bitmask: Optional[int] = PrivateAttr(default=None)
+
+    # Derived family stats are scanned repeatedly per eligibility pass but
+    # family_members rarely changes — cache on first access and let
+    # mutators call _drop_family_cache() after replacing the list.
+    @cached_property
     def num_children(self) -> int:
         return sum(1 for m in self.family_members if m.relationship == "child")
 
-    @property
+    @cached_property
     def num_daughters(self) -> int:
         return sum(
             1 for m in self.family_members
             if m.relationship == "child" and m.gender == Gender.FEMALE
         )
 
-    @property
+    @cached_property
     def has_school_age_children(self) -> bool:
         return any(
             m.relationship == "child" and 6 <= m.age <= 18
             for m in self.family_members
         )
+
+    def _drop_family_cache(self) -> None:
+        """Invalidate the cached family stats after family_members changes."""
+        for name in ("num_children", "num_daughters", "has_school_age_children"):
+            self.__dict__.pop(name, None)
@@ -1,10 +1,12 @@
 """Document intelligence data models (Req 3)."""
 
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from backend.util import clock
 from typing import Optional
-from datetime import datetime
 from enum import Enum
+import sys
 
 
 class DocumentType(str, Enum):
@@ -31,9 +33,21 @@ class AuthenticityStatus(str, Enum):
     MANUAL_REVIEW = "manual_review"
 
 
+# Interned values + by-value maps, mirroring the scheme enums: document
+# type strings arrive with every upload and are hashed in REQUIRED_FIELDS
+# lookups on each validation pass
+for _member in (*DocumentType, *AuthenticityStatus):
+    sys.intern(_member.value)
+del _member
+
+DOC_TYPE_BY_VALUE: dict[str, DocumentType] = {e.value: e for e in DocumentType}
+
+
 class ExtractionResult(BaseModel):
     """Structured data extracted from a document (simulating Textract)."""
 
+    model_config = ConfigDict(frozen=True)  # write-once extraction snapshot
+
     document_type: DocumentType
     extracted_fields: dict = Field(default_factory=dict)
     confidence: float = 0.0  # 0.0–1.0
@@ -41,6 +55,8 @@ class ExtractionResult(BaseModel):
 
 
 class ValidationIssue(BaseModel):
+    model_config = ConfigDict(frozen=True)  # issues are emitted, never edited
+
     field: str = ""
     issue: str = ""
     severity: str = "warning"  # warning / error
@@ -71,48 +87,68 @@ class Document(BaseModel):
     issue_date: Optional[str] = None
     expiry_date: Optional[str] = None
 
-    created_at: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
+    created_at: str = Field(default_factory=clock.now_iso)
+
+    # Cached "any error-severity issue" answer — batch operations read
+    # is_valid/has_errors per document, so the scan over validation_issues
+    # runs once per mutation instead of once per access. None = stale.
+    _has_error: Optional[bool] = PrivateAttr(default=None)
+
+    def set_issues(self, issues: list[ValidationIssue]) -> None:
+        """Replace validation_issues and refresh the cached error flag.
+        Mutators use this instead of assigning the field directly."""
+        self.validation_issues = issues
+        self._has_error = any(i.severity == "error" for i in issues)
 
     @property
     def is_valid(self) -> bool:
         return (
             self.authenticity_status == AuthenticityStatus.VERIFIED
-            and not any(i.severity == "error" for i in self.validation_issues)
+            and not self.has_errors
         )
 
     @property
     def has_errors(self) -> bool:
-        return any(i.severity == "error" for i in self.validation_issues)
-
-
-# Required fields per document type for extraction completeness (Property 1)
-REQUIRED_FIELDS: dict[DocumentType, list[str]] = {
-    DocumentType.AADHAAR: [
+        if self._has_error is None:
+            self._has_error = any(
+                i.severity == "error" for i in self.validation_issues
+            )
+        return self._has_error
+
+
+# Required fields per document type for extraction completeness (Property 1).
+# Declaration order is the order issues are reported in, so it is kept in
+# tuples; the frozenset view below serves the membership/difference checks.
+REQUIRED_FIELDS_ORDERED: dict[DocumentType, tuple[str, ...]] = {
+    DocumentType.AADHAAR: (
         "aadhaar_number", "name", "date_of_birth", "address", "gender"
-    ],
-    DocumentType.PAN: [
+    ),
+    DocumentType.PAN: (
         "pan_number", "name", "date_of_birth", "father_name"
-    ],
-    DocumentType.INCOME_CERTIFICATE: [
+    ),
+    DocumentType.INCOME_CERTIFICATE: (
         "certificate_number", "name", "annual_income",
         "issuing_authority", "validity_period"
-    ],
-    DocumentType.CASTE_CERTIFICATE: [
+    ),
+    DocumentType.CASTE_CERTIFICATE: (
         "certificate_number", "name", "caste_category",
         "issuing_authority"
-    ],
-    DocumentType.DOMICILE_CERTIFICATE: [
+    ),
+    DocumentType.DOMICILE_CERTIFICATE: (
         "certificate_number", "name", "state", "district",
         "issuing_authority"
-    ],
-    DocumentType.BANK_STATEMENT: [
+    ),
+    DocumentType.BANK_STATEMENT: (
         "account_number", "account_holder", "bank_name",
         "ifsc_code", "balance"
-    ],
-    DocumentType.EDUCATIONAL_CERTIFICATE: [
+    ),
+    DocumentType.EDUCATIONAL_CERTIFICATE: (
         "certificate_type", "institution", "name",
         "year_of_passing", "percentage_or_grade"
-    ],
+    ),
+}
+
+REQUIRED_FIELDS: dict[DocumentType, frozenset[str]] = {
+    doc_type: frozenset(fields)
+    for doc_type, fields in REQUIRED_FIELDS_ORDERED.items()
 }
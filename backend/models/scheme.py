@@ -1,9 +1,11 @@
 """Scheme and eligibility rule data models matching Neptune graph schema."""
 
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from enum import Enum
+from functools import cached_property
+import sys
 
 
 class SchemeCategory(str, Enum):
@@ -42,10 +44,28 @@ class RuleType(str, Enum):
     MINORITY = "minority"
     CUSTOM = "custom"
 
+# Enum values are compared and hashed constantly on the discover/submit
+# paths — intern them so those are pointer comparisons, and expose
+# by-value maps for callers resolving raw strings to members without a
+# try/except round-trip through the enum constructor.
+for _member in (*SchemeCategory, *RuleType):
+    sys.intern(_member.value)
+del _member
+
+SCHEME_CATEGORY_BY_VALUE: dict[str, SchemeCategory] = {
+    e.value: e for e in SchemeCategory
+}
+RULE_TYPE_BY_VALUE: dict[str, RuleType] = {e.value: e for e in RuleType}
+
+
 
 class EligibilityRule(BaseModel):
     """A single eligibility condition — maps to Rule node in Neptune graph."""
 
+    # The rule catalogue is immutable after import; frozen also lets
+    # Pydantic skip assignment machinery on these instances
+    model_config = ConfigDict(frozen=True)
+
     rule_id: str = ""
     rule_type: RuleType
     condition: str = ""  # e.g., "<=", ">=", "==", "in"
@@ -56,6 +76,11 @@ class EligibilityRule(BaseModel):
 class Scheme(BaseModel):
     """Government welfare scheme — maps to Scheme node in Neptune graph."""
 
+    # Schemes never change after the knowledge base is built — freeze so
+    # accidental mutation (which would desync the compiled predicate rows
+    # and prefilter masks) raises instead of corrupting the graph
+    model_config = ConfigDict(frozen=True)
+
     scheme_id: str
     name: str
     ministry: str
@@ -76,6 +101,12 @@ class Scheme(BaseModel):
     depends_on: list[str] = Field(default_factory=list)    # Scheme IDs
     conflicts_with: list[str] = Field(default_factory=list)  # Scheme IDs
 
+    @cached_property
+    def required_documents_set(self) -> frozenset[str]:
+        """Frozen view of required_documents for C-level membership checks;
+        built once per scheme on first use."""
+        return frozenset(self.required_documents)
+
 
 class SchemeMatch(BaseModel):
     """Result of eligibility matching — a scheme matched to a citizen."""
@@ -3,7 +3,11 @@ Full multi-agent pipeline route (Req 9).
 Single endpoint to execute the entire citizen benefit journey.
 """
 
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.util.responses import OrjsonResponse, dump_many
 
 from backend.agents.orchestrator import OrchestratorAgent
 from backend.knowledge.graph import SchemeGraph
@@ -31,9 +35,11 @@ async def run_pipeline(data: dict):
     profile_data = data.get("profile", data)
     scheme_id = data.get("scheme_id", "")
 
-    state = _orchestrator.start_workflow(profile_data, scheme_id)
+    state = await _orchestrator.start_workflow_async(profile_data, scheme_id)
 
-    return {
+    # Heavy payload — hand plain data straight to orjson, skipping the
+    # jsonable_encoder walk
+    return OrjsonResponse({
         "pipeline_id": state.pipeline_id,
         "status": state.current_stage.value,
         "citizen_id": state.citizen_id,
@@ -42,14 +48,18 @@ async def run_pipeline(data: dict):
         "documents_processed": state.documents_processed,
         "rejection_analysis": state.rejection_analysis,
         "application": state.application,
-        "events": [e.model_dump() for e in state.events],
+        "events": await dump_many(list(state.events)),
         "error": state.error,
-    }
+    })
 
 
 @router.get("/pipeline/{pipeline_id}")
-async def get_pipeline_status(pipeline_id: str):
-    """Get pipeline execution status."""
+async def get_pipeline_status(pipeline_id: str, since: int = 0):
+    """
+    Get pipeline execution status.
+    Pollers pass ?since=<next_since> from the previous response to receive
+    only new events instead of the full list every time.
+    """
     if not _orchestrator:
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
 
@@ -57,9 +67,43 @@ async def get_pipeline_status(pipeline_id: str):
     if not state:
         raise HTTPException(status_code=404, detail="Pipeline not found")
 
-    return {
+    # Global sequence numbers: events rolled off the capped deque still
+    # count, so `since` stays stable across truncation
+    events = list(state.events)
+    dropped = state.events_truncated
+    start = max(0, since - dropped)
+
+    return OrjsonResponse({
         "pipeline_id": state.pipeline_id,
         "status": state.current_stage.value,
-        "events": [e.model_dump() for e in state.events],
+        "events": await dump_many(events[start:]),
+        "next_since": dropped + len(events),
         "application": state.application,
-    }
+    })
+
+
+@router.get("/pipeline/{pipeline_id}/stream")
+async def stream_pipeline_events(pipeline_id: str, since: int = 0):
+    """
+    Pipeline events as Server-Sent Events. Each frame carries the event's
+    global sequence as its SSE id, so clients reconnect with ?since= (or
+    Last-Event-ID semantics) and never re-download the whole trail.
+    """
+    if not _orchestrator:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+
+    state = _orchestrator.get_pipeline(pipeline_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+
+    events = list(state.events)
+    dropped = state.events_truncated
+
+    async def _frames():
+        for i, event in enumerate(events):
+            seq = dropped + i
+            if seq < since:
+                continue
+            yield b"id: %d\ndata: %s\n\n" % (seq, orjson.dumps(event.model_dump()))
+
+    return StreamingResponse(_frames(), media_type="text/event-stream")
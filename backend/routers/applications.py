@@ -1,54 +1,110 @@
 """Application submission, tracking, and appeals routes (Req 5, 6, 7)."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 
-from backend.models.citizen import CitizenProfile
-from backend.agents.profiler import ProfilerAgent
-from backend.agents.execution import ExecutionAgent
-from backend.agents.adversarial import AdversarialAgent
-from backend.agents.appeals import AppealsAgent
+from backend.util.responses import dump_many
+from backend.agents._singletons import (
+    ADVERSARIAL as _adversarial,
+    APPEALS as _appeals,
+    EXECUTION as _execution,
+    PROFILER as _profiler,
+)
 
 router = APIRouter(prefix="/api/applications", tags=["Applications"])
 
-_profiler = ProfilerAgent()
-_execution = ExecutionAgent()
-_adversarial = AdversarialAgent()
-_appeals = AppealsAgent()
+
+# Request bodies as models compiled once at import — pydantic-core does
+# the required-field checks instead of per-handler data.get() plumbing
+class SubmitRequest(BaseModel):
+    citizen_id: str
+    scheme_id: str
+
+
+class SubmitBatchRequest(BaseModel):
+    citizen_id: str
+    scheme_ids: list[str] = Field(min_length=1)
+
+
+class PredictRequest(BaseModel):
+    citizen_id: str
+
+
+class AppealRequest(BaseModel):
+    citizen_id: str
+    language: str = "english"
 
 
 @router.post("/submit")
-async def submit_application(data: dict):
+async def submit_application(req: SubmitRequest):
     """
     Submit an application for a scheme (Req 5.1).
     Requires citizen_id and scheme_id in the body.
     """
-    citizen_id = data.get("citizen_id")
-    scheme_id = data.get("scheme_id")
-
-    if not citizen_id or not scheme_id:
-        raise HTTPException(status_code=400, detail="citizen_id and scheme_id required")
-
-    citizen = _profiler.get_profile(citizen_id)
+    citizen = _profiler.get_profile(req.citizen_id)
     if not citizen:
         raise HTTPException(status_code=404, detail="Citizen not found")
 
     try:
-        app = _execution.submit_application(citizen, scheme_id)
+        # Async variant: retry backoff awaits asyncio.sleep instead of
+        # stalling the event loop between attempts
+        app = await _execution.submit_application_async(citizen, req.scheme_id)
         return {
             "status": "submitted",
-            "application": app.model_dump(),
+            "application": app.dump_cached(),
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/submit_batch")
+async def submit_applications_batch(req: SubmitBatchRequest):
+    """
+    Submit one citizen's applications to several schemes in one call.
+    The profile is fetched once and submissions run concurrently, capped
+    by a semaphore so a large scheme list cannot flood the portals.
+    """
+    scheme_ids = req.scheme_ids
+
+    citizen = _profiler.get_profile(req.citizen_id)
+    if not citizen:
+        raise HTTPException(status_code=404, detail="Citizen not found")
+
+    sem = asyncio.Semaphore(16)
+
+    async def _submit(scheme_id: str):
+        async with sem:
+            return await _execution.submit_application_async(citizen, scheme_id)
+
+    results = await asyncio.gather(
+        *(_submit(sid) for sid in scheme_ids), return_exceptions=True
+    )
+
+    submitted: list[dict] = []
+    failed: list[dict] = []
+    for scheme_id, result in zip(scheme_ids, results):
+        if isinstance(result, BaseException):
+            failed.append({"scheme_id": scheme_id, "error": str(result)})
+        else:
+            submitted.append(result.dump_cached())
+
+    return {
+        "submitted": submitted,
+        "failed": failed,
+        "submitted_count": len(submitted),
+        "failed_count": len(failed),
+    }
+
+
 @router.get("/{application_id}")
 async def get_application_status(application_id: str):
     """Get application status with simulated progression (Req 6.1)."""
     app = _execution.poll_status(application_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
-    return {"application": app.model_dump()}
+    return {"application": app.dump_cached()}
 
 
 @router.get("/citizen/{citizen_id}")
@@ -56,21 +112,17 @@ async def list_citizen_applications(citizen_id: str):
     """List all applications for a citizen (Req 6.7)."""
     apps = _execution.list_applications(citizen_id)
     return {
-        "applications": [a.model_dump() for a in apps],
+        "applications": await dump_many(apps, "dump_cached"),
         "count": len(apps),
     }
 
 
 @router.post("/{application_id}/predict")
-async def predict_rejection(application_id: str, data: dict):
+async def predict_rejection(application_id: str, req: PredictRequest):
     """
     Run adversarial analysis on a pending application (Req 4).
     """
-    citizen_id = data.get("citizen_id")
-    if not citizen_id:
-        raise HTTPException(status_code=400, detail="citizen_id required")
-
-    citizen = _profiler.get_profile(citizen_id)
+    citizen = _profiler.get_profile(req.citizen_id)
     if not citizen:
         raise HTTPException(status_code=404, detail="Citizen not found")
 
@@ -78,7 +130,8 @@ async def predict_rejection(application_id: str, data: dict):
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    analysis = _adversarial.predict_rejection(citizen, app.scheme_id)
+    # CPU-bound scoring pass — run off the event loop
+    analysis = await _adversarial.predict_rejection_async(citizen, app.scheme_id)
     if not analysis:
         raise HTTPException(status_code=400, detail="Could not predict rejection")
 
@@ -86,7 +139,7 @@ async def predict_rejection(application_id: str, data: dict):
 
 
 @router.post("/{application_id}/appeal")
-async def generate_appeal(application_id: str, data: dict):
+async def generate_appeal(application_id: str, req: AppealRequest):
     """
     Generate and submit an appeal for a rejected application (Req 7).
     """
@@ -97,24 +150,23 @@ async def generate_appeal(application_id: str, data: dict):
     if app.status.value != "rejected":
         raise HTTPException(status_code=400, detail="Can only appeal rejected applications")
 
-    citizen_id = data.get("citizen_id")
-    citizen = _profiler.get_profile(citizen_id) if citizen_id else None
+    citizen = _profiler.get_profile(req.citizen_id)
     if not citizen:
         raise HTTPException(status_code=404, detail="Citizen not found")
 
-    language = data.get("language", "english")
-
-    # Analyze rejection
-    analysis = _appeals.analyze_rejection(app)
+    language = req.language
 
-    # Generate letter
-    letter = _appeals.generate_appeal_letter(app, citizen, language)
+    def _run_appeal():
+        # Analysis + letter templating is CPU work; run the whole appeal
+        # pipeline in one worker-thread hop
+        analysis = _appeals.analyze_rejection(app)
+        letter = _appeals.generate_appeal_letter(app, citizen, language)
+        return analysis, letter, _appeals.submit_appeal(app, letter["letter_text"])
 
-    # Submit appeal
-    app = _appeals.submit_appeal(app, letter["letter_text"])
+    analysis, letter, app = await asyncio.to_thread(_run_appeal)
 
     return {
         "analysis": analysis,
         "letter": letter,
-        "application": app.model_dump(),
+        "application": app.dump_cached(),
     }
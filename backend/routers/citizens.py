@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter, HTTPException
 
-from backend.agents.profiler import ProfilerAgent
+from backend.util.responses import OrjsonResponse, dump_many
+
+from backend.agents._singletons import PROFILER as _profiler
 
 router = APIRouter(prefix="/api/citizens", tags=["Citizens"])
-_profiler = ProfilerAgent()
 
 
 @router.post("/profile")
@@ -26,7 +27,10 @@ async def create_profile(data: dict):
 async def list_profiles():
     """List all citizen profiles."""
     profiles = _profiler.list_profiles()
-    return {"profiles": [p.model_dump() for p in profiles], "count": len(profiles)}
+    # Skip jsonable_encoder — dumps are plain data and orjson handles them
+    return OrjsonResponse(
+        {"profiles": await dump_many(profiles), "count": len(profiles)}
+    )
 
 
 @router.get("/{citizen_id}")
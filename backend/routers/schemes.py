@@ -1,14 +1,45 @@
 """Scheme discovery and eligibility routes (Req 2, 8)."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from pydantic import TypeAdapter
 
 from backend.models.citizen import CitizenProfile
 from backend.agents.eligibility import EligibilityAgent
 from backend.knowledge.graph import SchemeGraph
-from backend.knowledge.schemes_data import SCHEMES, SCHEME_MAP
+from backend.knowledge.schemes_data import SCHEMES
 
 router = APIRouter(prefix="/api/schemes", tags=["Schemes"])
 
+# The catalogue is immutable — serialize it once at import instead of
+# re-dumping ~16 models per request, and give the full listing a stable
+# ETag so clients can skip the body with If-None-Match
+_SCHEMES_JSON: list[dict] = [s.model_dump(mode="json") for s in SCHEMES]
+_SCHEME_JSON_MAP: dict[str, dict] = {
+    d["scheme_id"]: d for d in _SCHEMES_JSON
+}
+_SCHEMES_BODY: bytes = orjson.dumps(
+    {"schemes": _SCHEMES_JSON, "count": len(_SCHEMES_JSON)}
+)
+_SCHEMES_ETAG: str = '"%s"' % hashlib.blake2b(_SCHEMES_BODY, digest_size=16).hexdigest()
+
+# Compiled-once validator for posted profiles — reuses one core-schema
+# graph across requests instead of going through the model constructor
+_CITIZEN_ADAPTER: TypeAdapter[CitizenProfile] = TypeAdapter(CitizenProfile)
+
+# Rendered /discover responses keyed by a digest of the posted profile —
+# dashboards re-POST the same profile on every poll, and the catalogue
+# the answers derive from is static for the process lifetime
+_DISCOVER_CACHE: OrderedDict[bytes, bytes] = OrderedDict()
+_DISCOVER_CACHE_MAX = 2048
+_discover_lock = threading.Lock()
+
 # Graph will be initialized in main.py startup and injected
 _graph: SchemeGraph | None = None
 _eligibility: EligibilityAgent | None = None
@@ -21,21 +52,24 @@ def init_graph(graph: SchemeGraph):
 
 
 @router.get("/")
-async def list_schemes():
+async def list_schemes(request: Request):
     """List all available welfare schemes (Req 8)."""
-    return {
-        "schemes": [s.model_dump() for s in SCHEMES],
-        "count": len(SCHEMES),
-    }
+    if request.headers.get("if-none-match") == _SCHEMES_ETAG:
+        return Response(status_code=304, headers={"ETag": _SCHEMES_ETAG})
+    return Response(
+        content=_SCHEMES_BODY,
+        media_type="application/json",
+        headers={"ETag": _SCHEMES_ETAG},
+    )
 
 
 @router.get("/{scheme_id}")
 async def get_scheme(scheme_id: str):
     """Get a specific scheme by ID."""
-    scheme = SCHEME_MAP.get(scheme_id)
+    scheme = _SCHEME_JSON_MAP.get(scheme_id)
     if not scheme:
         raise HTTPException(status_code=404, detail="Scheme not found")
-    return {"scheme": scheme.model_dump()}
+    return {"scheme": scheme}
 
 
 @router.post("/discover")
@@ -47,18 +81,44 @@ async def discover_schemes(profile: dict):
     if not _eligibility:
         raise HTTPException(status_code=503, detail="Scheme graph not initialized")
 
+    # Identical payloads produce identical answers — serve repeats from
+    # the rendered-response cache before validation even runs
+    try:
+        key = hashlib.blake2b(
+            orjson.dumps(profile, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).digest()
+    except TypeError:
+        key = None
+    if key is not None:
+        with _discover_lock:
+            body = _DISCOVER_CACHE.get(key)
+            if body is not None:
+                _DISCOVER_CACHE.move_to_end(key)
+                return Response(content=body, media_type="application/json")
+
+    # Recursive validation of a large profile (family members, documents)
+    # costs milliseconds — run it on a worker thread so the event loop
+    # keeps serving other requests meanwhile
     try:
-        citizen = CitizenProfile(**profile)
+        citizen = await asyncio.to_thread(_CITIZEN_ADAPTER.validate_python, profile)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid profile: {e}")
 
     matches = _eligibility.discover_schemes(citizen)
 
-    return {
+    # Rendered once with orjson — no jsonable_encoder walk over the
+    # (large) match payload; model_dump already yields plain data
+    body = orjson.dumps({
         "matches": [m.model_dump() for m in matches],
         "eligible_count": sum(1 for m in matches if m.is_eligible),
         "total_schemes": len(matches),
-    }
+    })
+    if key is not None:
+        with _discover_lock:
+            _DISCOVER_CACHE[key] = body
+            if len(_DISCOVER_CACHE) > _DISCOVER_CACHE_MAX:
+                _DISCOVER_CACHE.popitem(last=False)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/conflicts")
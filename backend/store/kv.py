@@ -0,0 +1,83 @@
+"""
+Sharded in-memory key-value store (DynamoDB sim).
+Replaces the bare module-level dicts that backed citizens, applications,
+and pipelines: entries are spread over lock-guarded shards so concurrent
+ASGI workers don't contend on one dict, and each shard is bounded with
+TTL + oldest-first eviction so long-running demos can't grow without limit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterator, TypeVar
+
+V = TypeVar("V")
+
+_DEFAULT_SHARDS = 16
+_DEFAULT_MAXSIZE = 100_000   # per shard
+_DEFAULT_TTL = 24 * 3600.0   # seconds
+
+
+class ShardedStore:
+    """Dict-like store sharded by key hash, safe under concurrent access."""
+
+    def __init__(
+        self,
+        shards: int = _DEFAULT_SHARDS,
+        maxsize_per_shard: int = _DEFAULT_MAXSIZE,
+        ttl_seconds: float = _DEFAULT_TTL,
+    ) -> None:
+        self._mask = shards - 1
+        if shards & self._mask:
+            raise ValueError("shards must be a power of two")
+        self._maxsize = maxsize_per_shard
+        self._ttl = ttl_seconds
+        # Each shard maps key -> (expiry, value); insertion order doubles
+        # as eviction order since TTLs are uniform
+        self._shards: list[dict[str, tuple[float, V]]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard(self, key: str) -> int:
+        return hash(key) & self._mask
+
+    def __setitem__(self, key: str, value: V) -> None:
+        i = self._shard(key)
+        with self._locks[i]:
+            shard = self._shards[i]
+            shard.pop(key, None)  # re-insert so eviction order stays fresh
+            if len(shard) >= self._maxsize:
+                shard.pop(next(iter(shard)))  # evict oldest entry
+            shard[key] = (time.monotonic() + self._ttl, value)
+
+    def get(self, key: str, default: V | None = None) -> V | None:
+        i = self._shard(key)
+        with self._locks[i]:
+            entry = self._shards[i].get(key)
+            if entry is None:
+                return default
+            expiry, value = entry
+            if expiry < time.monotonic():
+                del self._shards[i][key]
+                return default
+            return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __delitem__(self, key: str) -> None:
+        i = self._shard(key)
+        with self._locks[i]:
+            del self._shards[i][key]
+
+    def values(self) -> Iterator[V]:
+        """Snapshot of all live values across shards."""
+        now = time.monotonic()
+        result: list[V] = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                result.extend(v for expiry, v in shard.values() if expiry >= now)
+        return iter(result)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
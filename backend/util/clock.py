@@ -0,0 +1,28 @@
+"""
+Per-stage timestamp cache.
+Audit entries and pipeline events stamp datetime.now().isoformat() on
+every append — a clock read plus a fresh string each time. Stages and
+request handlers instead refresh() once at entry and every stamp within
+that scope reuses the cached string. Backed by a ContextVar so
+concurrent asyncio tasks never see each other's timestamps.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import datetime
+
+_cached: ContextVar[str] = ContextVar("now_iso", default="")
+
+
+def refresh() -> str:
+    """Re-read the clock and cache the ISO string for this context."""
+    value = datetime.now().isoformat()
+    _cached.set(value)
+    return value
+
+
+def now_iso() -> str:
+    """Cached timestamp for this context; falls back to a live read if
+    no stage has refreshed yet (e.g. ad-hoc scripts)."""
+    return _cached.get() or datetime.now().isoformat()
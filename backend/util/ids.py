@@ -0,0 +1,32 @@
+"""
+Cheap short-id generation shared by all agents.
+Draws entropy from os.urandom in 4KB chunks held in a thread-local ring
+buffer, so issuing an id is a string slice instead of a per-call
+getrandom syscall plus UUID object construction.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+_CHUNK_BYTES = 4096
+
+_tls = threading.local()
+
+
+def short_id(prefix: str, nbytes: int = 4) -> str:
+    """
+    Return an id like "APP-1A2B3C4D" with nbytes of entropy (2×nbytes hex
+    chars) after the prefix. Thread-safe: each thread owns its buffer.
+    """
+    ndigits = nbytes * 2
+    buf: str = getattr(_tls, "buf", "")
+    pos: int = getattr(_tls, "pos", 0)
+
+    if pos + ndigits > len(buf):
+        buf = _tls.buf = os.urandom(_CHUNK_BYTES).hex().upper()
+        pos = 0
+
+    _tls.pos = pos + ndigits
+    return f"{prefix}-{buf[pos:pos + ndigits]}"
@@ -0,0 +1,39 @@
+"""
+orjson-backed response class and serialization helpers.
+fastapi.responses.ORJSONResponse is deprecated on current FastAPI, so we
+render through orjson ourselves — same behavior, no per-request warning.
+Handlers pass plain already-dumped data and skip the jsonable_encoder walk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Sequence
+
+import orjson
+from fastapi import Response
+
+# Pool for offloading bulk model dumps off the event loop
+_DUMP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dump")
+
+# Below this, the executor hop costs more than dumping inline
+_INLINE_DUMP_LIMIT = 8
+
+
+async def dump_many(objs: Sequence, method: str = "model_dump") -> list:
+    """Dump a batch of models without blocking the event loop.
+    Large batches run in a worker thread; small ones are dumped inline."""
+    dump = operator.methodcaller(method)
+    if len(objs) <= _INLINE_DUMP_LIMIT:
+        return [dump(o) for o in objs]
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DUMP_POOL, lambda: [dump(o) for o in objs])
+
+
+class OrjsonResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
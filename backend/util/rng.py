@@ -0,0 +1,41 @@
+"""
+Buffered uniform draws for the simulation hot paths.
+Execution attempts and status polls roll random.random() in a loop;
+refilling a thread-local buffer in one batch amortizes the module-level
+attribute lookups and keeps the per-draw cost to an index increment.
+A seed() hook keeps simulations reproducible in scripted runs.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+
+_BUFFER_SIZE = 8192
+
+_tls = threading.local()
+
+# Dedicated generator so seeding the simulation doesn't perturb callers
+# that use the global random module directly (e.g. document extraction)
+_rng = random.Random()
+
+
+def seed(value: int | None = None) -> None:
+    """Reseed the simulation generator and drop buffered draws."""
+    _rng.seed(value)
+    _tls.buf = []
+    _tls.pos = 0
+
+
+def next_uniform() -> float:
+    """Return the next uniform draw in [0, 1) from the thread-local buffer."""
+    pos: int = getattr(_tls, "pos", 0)
+    buf: list[float] = getattr(_tls, "buf", [])
+
+    if pos >= len(buf):
+        rand = _rng.random
+        buf = _tls.buf = [rand() for _ in range(_BUFFER_SIZE)]
+        pos = 0
+
+    _tls.pos = pos + 1
+    return buf[pos]